@@ -90,13 +90,10 @@ class YouTubeAutomation:
             request = ContentRequest(
                 content_type=content_type,
                 topic=topic,
-                target_duration=45  # 45 segundos para Shorts
+                target_duration=45,  # 45 segundos para Shorts
+                topic_data=topic_data  # Datos del tema para prompts variables
             )
-            
-            # Agregar topic_data para prompts variables
-            if topic_data:
-                request.topic_data = topic_data
-            
+
             generated_content = self.content_generator.generate_content(request)
             result["steps_completed"].append("content_generation")
             result["generated_content"] = {
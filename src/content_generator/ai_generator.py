@@ -5,22 +5,25 @@ Soporte para OpenAI (pago) y Ollama (local gratuito).
 
 import openai
 import logging
+import re
+import sys
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, List, Optional
-from dataclasses import dataclass
+from dataclasses import dataclass, replace
 from config.settings import settings, CONTENT_TEMPLATES
 
-# Importar Ollama generator
-try:
-    from .ollama_generator import OllamaGenerator, OllamaConfig
-    OLLAMA_AVAILABLE = True
-except ImportError:
-    OLLAMA_AVAILABLE = False
-try:
+# Detectar módulos opcionales sin pagar un ImportError real en cada import
+# (find_spec solo consulta los finders; el import pesado se difiere al uso)
+import importlib.util
+
+OLLAMA_AVAILABLE = importlib.util.find_spec(".ollama_generator", package=__package__) is not None
+
+if importlib.util.find_spec("config.localization") is not None:
     from config.localization import (
-        get_current_config, get_theme_config, 
+        get_current_config, get_theme_config,
         get_localized_texts, DEFAULT_LANGUAGE, DEFAULT_THEME
     )
-except ImportError:
+else:
     # Fallback
     DEFAULT_LANGUAGE = "es"
     DEFAULT_THEME = "curiosidades"
@@ -33,17 +36,195 @@ except ImportError:
 
 logger = logging.getLogger(__name__)
 
-@dataclass
+# Lista de palabras problemáticas que causan rechazo de la IA
+_PROBLEMATIC_KEYWORDS = (
+    'alimentos', 'suplementos', 'medicamentos', 'fármacos', 'pastillas',
+    'adelgazar', 'dieta', 'peso', 'grasa', 'músculo', 'proteína',
+    'vitaminas', 'energía inmediatamente', 'salud', 'curar', 'sanar',
+    'medicina', 'tratamiento', 'terapia', 'remedio', 'dosis'
+)
+
+# Lista expandida de frases de rechazo (incluye el caso reportado por el usuario)
+_REJECTION_PHRASES = (
+    # Spanish rejections - Basic
+    "no puedo generar contenido",
+    "no puedo crear contenido",
+    "lo siento, pero no",
+    "lo siento pero no",
+    "lo siento, no puedo",
+    "lo siento pero no puedo",  # Patrón específico reportado
+    "lo siento pero no puedo generar",
+    "lo siento pero no puedo generar contenido",
+    "lo siento pero no puedo generar contenido sobre",
+
+    # Specific content types that get rejected
+    "contenido sobre fakis",     # Caso específico reportado por usuario
+    "contenido sobre deepfakes",
+    "contenido sobre suplementos",
+    "promoción de alimentos",
+    "promoción de suplementos",
+    "contenido relacionado con la promoción",
+    "contenido que promueva",
+
+    # Other Spanish rejection patterns
+    "no es apropiado",
+    "no puedo proporcionar",
+    "no puedo ayudar",
+    "no está permitido",
+    "no es recomendable",
+    "evitar la promoción",
+    "no puedo generar",
+    "no puedo crear",
+    "no puedo escribir",
+    "¿en qué puedo ayudarte?",
+    "en qué puedo ayudarte",
+    "como modelo de lenguaje",
+    "como ia no puedo",
+    "mi programación no me permite",
+
+    # English rejections
+    "sorry, i can't",
+    "i cannot generate",
+    "i'm not able to",
+    "i can't create",
+    "i cannot create",
+    "i'm sorry, but",
+    "i apologize, but",
+    "i can't generate content",
+    "i cannot generate content about",
+    "as an ai, i cannot",
+    "as a language model",
+    "against my programming"
+)
+
+
+# Máscara de bits con las primeras letras de las palabras problemáticas:
+# si el tema no contiene ninguna de esas letras, el escaneo completo sobra.
+_PROBLEMATIC_FIRST_LETTER_MASK = 0
+for _keyword in _PROBLEMATIC_KEYWORDS:
+    _PROBLEMATIC_FIRST_LETTER_MASK |= 1 << (ord(_keyword[0]) - 97)
+del _keyword
+
+
+def _may_contain_problematic(topic_lower: str) -> bool:
+    """Prefiltro barato: ¿aparece en el tema alguna primera letra problemática?"""
+    mask = 0
+    for ch in topic_lower:
+        c = ord(ch) - 97
+        if 0 <= c < 26:
+            mask |= 1 << c
+    return bool(mask & _PROBLEMATIC_FIRST_LETTER_MASK)
+
+
+def _build_automaton(keywords):
+    """Construye un autómata Aho–Corasick para escanear múltiples patrones en una pasada."""
+    automaton = ahocorasick.Automaton()
+    for keyword in keywords:
+        automaton.add_word(keyword, keyword)
+    automaton.make_automaton()
+    return automaton
+
+
+# Autómatas Aho–Corasick (opcional): una sola pasada O(n) en vez de un
+# str.find por cada keyword. Fallback al escaneo lineal si no está instalado.
+try:
+    import ahocorasick
+    _PROBLEMATIC_AC = _build_automaton(_PROBLEMATIC_KEYWORDS)
+    _REJECTION_AC = _build_automaton(_REJECTION_PHRASES)
+    AHOCORASICK_AVAILABLE = True
+except ImportError:
+    _PROBLEMATIC_AC = None
+    _REJECTION_AC = None
+    AHOCORASICK_AVAILABLE = False
+
+
+# Regex para separar los guiones de una respuesta batcheada de OpenAI
+_BATCH_SCRIPT_RE = re.compile(r'<<<SCRIPT (\d+)>>>(.*?)<<<END \1>>>', re.DOTALL)
+
+# Palabras asociadas a rechazos (lookup O(1) por palabra, sin substring por token)
+_REJECTION_WORDS = frozenset({
+    "sorry", "siento", "disculpa", "apologize", "lamento",
+    "puedo", "can't", "cannot", "no", "not"
+})
+_REJECTION_WORD_TRIM = ".,;:!¡¿?\"'()"
+
+# Indicadores de rechazo usados al extraer título/narración
+_REJECTION_INDICATORS = (
+    "lo siento", "no puedo", "i'm sorry", "i can't",
+    "contenido sobre", "generar contenido", "crear contenido"
+)
+
+# Patrones precompilados del parser de narración (se ejecutan por cada guión)
+_NARRATION_SECTION_RE = re.compile(
+    r'\*{0,2}NARRACIÓN\*{0,2}:?\s*(["\"]?)([^"]*?)\1(?=\*{0,2}DESCRIPCIÓN|\*{0,2}TAGS|\*{0,2}THUMBNAIL|$)',
+    re.IGNORECASE | re.DOTALL
+)
+_ASTERISK_RUN_RE = re.compile(r'\*{2,}')
+_NARRATION_START_RE = re.compile(r'(?i)(narración:|guión:|\*\*narración\*\*)')
+_NARRATION_STOP_PREFIXES = (
+    '**descripción', '**tags', '**thumbnail',
+    'descripción:', 'tags:', 'thumbnail:'
+)
+
+# Plantillas de prompt estáticas (se formatean por llamada, no se reconstruyen)
+_DESCRIPTION_PROMPT_TEMPLATE = """
+        Basándote en este guión de YouTube sobre "{topic}", crea una descripción optimizada:
+
+        GUIÓN:
+        {script_head}...
+
+        REQUISITOS para la descripción:
+        1. Máximo 200 palabras
+        2. Incluir palabras clave SEO
+        3. Call-to-action para suscribirse
+        4. Mencionar contenido relacionado
+        5. Incluir hashtags relevantes
+        6. Tono amigable y profesional
+
+        DESCRIPCIÓN:
+        """
+
+# Checks SEO ponderados: tabla (condición, peso) en vez de cascada de ifs;
+# los pesos quedan en un solo sitio y la función es un sum() sin ramas
+_SEO_HOT_WORDS = ("top", "mejor", "increíble")
+_SEO_CHECKS = (
+    (lambda title, desc, tags: 30 <= len(title) <= 70, 15),
+    (lambda title, desc, tags: any(word in title for word in _SEO_HOT_WORDS), 15),
+    (lambda title, desc, tags: len(desc) >= 100, 15),
+    (lambda title, desc, tags: "suscríbete" in desc, 15),
+    (lambda title, desc, tags: len(tags) >= 5, 20),
+    (lambda title, desc, tags: len(tags) <= 15, 20),
+)
+
+# Tags extra por tipo de contenido
+_TOPIC_TYPE_TAGS = {
+    "TOP_5": ("ranking", "mejores", "lista"),
+    "CURIOSIDADES": ("increíble", "sorprendente", "sabías que"),
+}
+
+
+def _contains_any(text: str, automaton, keywords) -> bool:
+    """Busca si el texto contiene alguno de los patrones (AC si disponible, escaneo si no)."""
+    if automaton is not None:
+        return next(automaton.iter(text), None) is not None
+    return any(keyword in text for keyword in keywords)
+
+# slots=True solo existe desde Python 3.10; en 3.8/3.9 (el suelo soportado)
+# se degrada a dataclasses normales con __dict__
+_DATACLASS_SLOTS = {"slots": True} if sys.version_info >= (3, 10) else {}
+
+@dataclass(frozen=True, **_DATACLASS_SLOTS)
 class ContentRequest:
-    """Solicitud de generación de contenido."""
+    """Solicitud de generación de contenido (inmutable, sin __dict__ en 3.10+)."""
     content_type: str  # Dinámico según configuración
     topic: str
     target_duration: int = 45  # 45 segundos para Shorts
     language: str = DEFAULT_LANGUAGE  # Configurable
     target_audience: str = "general"
     theme: str = DEFAULT_THEME  # Temática configurable
+    topic_data: Optional[Dict] = None  # Datos del tema (hook, ending, prompt)
 
-@dataclass
+@dataclass(frozen=True, **_DATACLASS_SLOTS)
 class GeneratedContent:
     """Contenido generado por IA."""
     title: str
@@ -72,6 +253,14 @@ class ContentGenerator:
         self.config = get_current_config()
         self.theme_config = get_theme_config(self.theme, self.language)
         self.texts = get_localized_texts(self.language)
+
+        # Fragmentos de prompt que solo dependen de la configuración:
+        # se calculan una vez aquí en lugar de en cada _build_localized_prompt
+        self._prompt_hashtags = " ".join(self.texts.get("hashtags", ["#Shorts", "#Viral"]))
+        self._prompt_intro_phrases = ', '.join(self.texts.get('intro_phrases', ['¿Sabías que...'])[:2])
+        self._system_prompt = f"""Eres un experto creador de contenido para YouTube Shorts en {self.config['language_config']['name']}.
+        Especialízate en {self.theme_config.get('description', 'contenido viral')} para el canal '{self.theme_config.get('channel_name', 'Canal Viral')}'.
+        Crea contenido viral, interesante y bien estructurado."""
         
         # Configurar proveedores de IA
         self.ollama_generator = None
@@ -83,6 +272,7 @@ class ContentGenerator:
         
         if self.use_ollama and OLLAMA_AVAILABLE:
             try:
+                from .ollama_generator import OllamaGenerator
                 self.ollama_generator = OllamaGenerator()
                 if self.ollama_generator.is_installed:
                     logger.info("✅ Usando Ollama (IA local gratuita)")
@@ -107,6 +297,7 @@ class ContentGenerator:
         # Prioridad: Ollama (gratis) > OpenAI (pago)
         if OLLAMA_AVAILABLE:
             try:
+                from .ollama_generator import OllamaGenerator
                 test_generator = OllamaGenerator()
                 if test_generator.is_installed:
                     logger.info("🎯 Auto-seleccionado: Ollama (gratuito)")
@@ -122,37 +313,32 @@ class ContentGenerator:
     
     def _build_localized_prompt(self, request: ContentRequest) -> dict:
         """Construye prompts localizados basados en configuración."""
-        # Usar configuración localizada
+        # Usar configuración localizada (sin mutar la solicitud, que es inmutable)
         content_types = self.theme_config.get("content_types", ["TOP_5"])
         if request.content_type not in content_types:
-            request.content_type = content_types[0]  # Usar el primero disponible
-            
-        hashtags = " ".join(self.texts.get("hashtags", ["#Shorts", "#Viral"]))
-        
-        system_prompt = f"""Eres un experto creador de contenido para YouTube Shorts en {self.config['language_config']['name']}. 
-        Especialízate en {self.theme_config.get('description', 'contenido viral')} para el canal '{self.theme_config.get('channel_name', 'Canal Viral')}'.
-        Crea contenido viral, interesante y bien estructurado."""
-        
-        user_prompt = f"""Crea un guión para un YouTube SHORT sobre "{request.content_type.replace('_', ' ')} {request.topic}" (máximo {request.target_duration} segundos).
+            request = replace(request, content_type=content_types[0])  # Usar el primero disponible
+
+        content_type_label = request.content_type.replace('_', ' ')
+        user_prompt = f"""Crea un guión para un YouTube SHORT sobre "{content_type_label} {request.topic}" (máximo {request.target_duration} segundos).
 
         REQUISITOS:
-        1. Título llamativo ({hashtags})
+        1. Título llamativo ({self._prompt_hashtags})
         2. Gancho inicial potente (primeros 3 segundos)
-        3. Formato {request.content_type.replace('_', ' ')} dinámico 
+        3. Formato {content_type_label} dinámico
         4. Transiciones rápidas y enganchantes
         5. Call-to-action final
         6. Idioma: {self.config['language_config']['name']}
-        
-        Usa frases como: {', '.join(self.texts.get('intro_phrases', ['¿Sabías que...'])[:2])}
-        
+
+        Usa frases como: {self._prompt_intro_phrases}
+
         FORMATO:
         TÍTULO: [título viral con emojis]
         NARRACIÓN: [SOLO el texto que el locutor debe leer, SIN instrucciones técnicas, SIN descripciones de imágenes, SIN tiempos - solo texto narrativo puro para TTS]
         DESCRIPCIÓN: [descripción SEO]
         TAGS: [5-8 tags]
         THUMBNAIL: [3 sugerencias]"""
-        
-        return {"system": system_prompt, "user": user_prompt}
+
+        return {"system": self._system_prompt, "user": user_prompt}
 
     def generate_content(self, request: ContentRequest) -> GeneratedContent:
         """
@@ -177,13 +363,30 @@ class ContentGenerator:
             
             # Generar guión principal
             raw_content = self._generate_script(validated_request, template)
-            
+
+            # Calcular la versión en minúsculas UNA sola vez y reutilizarla
+            # (evita repetir str.lower() sobre el mismo texto en cada helper)
+            raw_lower = raw_content.lower()
+
             # Extraer elementos específicos del contenido generado
-            title = self._extract_title(raw_content)
-            script = self._extract_narration(raw_content)  # SOLO narración para TTS
-            description = self._generate_description(script, validated_request.topic)
-            tags = self._generate_tags(validated_request.topic, validated_request.content_type)
-            thumbnail_suggestions = self._generate_thumbnail_ideas(validated_request.topic)
+            title = self._extract_title(raw_content, raw_lower)
+            script = self._extract_narration(raw_content, raw_lower)  # SOLO narración para TTS
+
+            # Prefijo del guión para los prompts derivados: un solo slice
+            # compartido en vez de re-cortar el script en cada helper
+            script_head = script[:500]
+
+            # Los tres helpers son independientes entre sí: lanzarlos en
+            # paralelo evita esperar la ronda LLM de la descripción antes
+            # de calcular tags/thumbnails (httpx.Client es thread-safe)
+            with ThreadPoolExecutor(max_workers=3) as executor:
+                f_description = executor.submit(self._generate_description, script_head, validated_request.topic)
+                f_tags = executor.submit(self._generate_tags, validated_request.topic, validated_request.content_type)
+                f_thumbnails = executor.submit(self._generate_thumbnail_ideas, validated_request.topic)
+
+                description = f_description.result()
+                tags = f_tags.result()
+                thumbnail_suggestions = f_thumbnails.result()
             
             # Calcular duración estimada basada en narración pura
             estimated_duration = self._estimate_duration(script)
@@ -219,17 +422,14 @@ class ContentGenerator:
             ContentRequest: Solicitud con tema validado/corregido
         """
         original_topic = request.topic.lower()
-        
-        # Lista de palabras problemáticas que causan rechazo
-        problematic_keywords = [
-            'alimentos', 'suplementos', 'medicamentos', 'fármacos', 'pastillas',
-            'adelgazar', 'dieta', 'peso', 'grasa', 'músculo', 'proteína',
-            'vitaminas', 'energía inmediatamente', 'salud', 'curar', 'sanar',
-            'medicina', 'tratamiento', 'terapia', 'remedio', 'dosis'
-        ]
-        
-        # Verificar si el tema contiene palabras problemáticas
-        is_problematic = any(keyword in original_topic for keyword in problematic_keywords)
+
+        # Prefiltro por letras: la mayoría de temas no comparte primera letra
+        # con ninguna keyword problemática y se salta el escaneo completo
+        if not _may_contain_problematic(original_topic):
+            return request
+
+        # Verificar si el tema contiene palabras problemáticas (una sola pasada)
+        is_problematic = _contains_any(original_topic, _PROBLEMATIC_AC, _PROBLEMATIC_KEYWORDS)
         
         if is_problematic:
             logger.warning(f"⚠️ Tema problemático detectado: '{request.topic}' - Generando alternativa segura...")
@@ -271,16 +471,9 @@ class ContentGenerator:
             selected_topic = alternatives[topic_hash % len(alternatives)]
             
             logger.info(f"✅ Tema alternativo seleccionado: '{selected_topic}'")
-            
-            # Crear nueva solicitud con tema seguro
-            return ContentRequest(
-                content_type=request.content_type,
-                topic=selected_topic,
-                target_duration=request.target_duration,
-                language=request.language,
-                target_audience=request.target_audience,
-                theme=request.theme
-            )
+
+            # Crear nueva solicitud con tema seguro (copia de slots, resto intacto)
+            return replace(request, topic=selected_topic)
         
         # Si el tema es seguro, retornar sin cambios
         return request
@@ -296,7 +489,7 @@ class ContentGenerator:
                 topic=request.topic,
                 language=self.language,
                 content_type=request.content_type,
-                topic_data=getattr(request, 'topic_data', None)
+                topic_data=request.topic_data
             )
             
             if ollama_result:
@@ -346,79 +539,124 @@ class ContentGenerator:
             logger.error(f"Error en IA: {e}")
             raise
     
-    def _is_ai_rejection(self, content: str) -> bool:
+    def _generate_scripts_batched(self, requests: List[ContentRequest], k: int = 5) -> List[str]:
+        """
+        Genera varios guiones en una sola llamada a OpenAI para amortizar
+        el system prompt (se paga una vez en vez de una por tema).
+
+        Args:
+            requests: Solicitudes de contenido (máximo k por llamada)
+            k: Número máximo de temas por request a OpenAI
+
+        Returns:
+            List[str]: Un guión crudo por solicitud (en el mismo orden)
+        """
+        scripts = []
+
+        for start in range(0, len(requests), k):
+            batch = requests[start:start + k]
+
+            template = CONTENT_TEMPLATES.get(batch[0].content_type) or next(iter(CONTENT_TEMPLATES.values()))
+
+            # Un solo prompt con todos los temas, delimitados con marcadores
+            topic_blocks = "\n".join(
+                f"Tema {i + 1}: {req.content_type.replace('_', ' ')} {req.topic}"
+                for i, req in enumerate(batch)
+            )
+            user_prompt = (
+                f"Genera {len(batch)} guiones SEPARADOS para YouTube Shorts, uno por tema.\n"
+                f"Delimita cada guión entre <<<SCRIPT i>>> y <<<END i>>> (i = número del tema).\n"
+                f"Cada guión debe seguir el formato habitual (TÍTULO, NARRACIÓN, DESCRIPCIÓN, TAGS, THUMBNAIL).\n\n"
+                f"{topic_blocks}"
+            )
+
+            try:
+                client = openai.OpenAI(api_key=settings.OPENAI_API_KEY)
+                response = client.chat.completions.create(
+                    model=settings.OPENAI_MODEL,
+                    messages=[
+                        {"role": "system", "content": template["system_prompt"]},
+                        {"role": "user", "content": user_prompt}
+                    ],
+                    max_tokens=settings.OPENAI_MAX_TOKENS * len(batch),
+                    temperature=0.8,
+                    top_p=0.9
+                )
+                content = response.choices[0].message.content.strip()
+            except Exception as e:
+                logger.error(f"Error en generación batcheada: {e}")
+                raise
+
+            # Repartir la respuesta entre las solicitudes del batch
+            parsed = {int(num): script.strip() for num, script in _BATCH_SCRIPT_RE.findall(content)}
+
+            for i, req in enumerate(batch):
+                script = parsed.get(i + 1)
+                if script and not self._is_ai_rejection(script):
+                    scripts.append(script)
+                else:
+                    # Marcador ausente o rechazo: regenerar este tema individualmente
+                    logger.warning(f"⚠️ Guión {i + 1} ausente/rechazado en el batch - Generando individual: '{req.topic}'")
+                    scripts.append(self._generate_script(req, template))
+
+        return scripts
+
+    def generate_content_batch(self, requests: List[ContentRequest], k: int = 5) -> List[GeneratedContent]:
+        """
+        Genera contenido completo para varios temas amortizando el system prompt.
+
+        Args:
+            requests: Solicitudes de contenido
+            k: Temas por llamada a OpenAI
+
+        Returns:
+            List[GeneratedContent]: Contenido generado por solicitud
+        """
+        validated = [self._validate_and_fix_topic(req) for req in requests]
+        raw_scripts = self._generate_scripts_batched(validated, k=k)
+
+        results = []
+        for req, raw_content in zip(validated, raw_scripts):
+            raw_lower = raw_content.lower()
+            title = self._extract_title(raw_content, raw_lower)
+            script = self._extract_narration(raw_content, raw_lower)
+            description = self._generate_description(script[:500], req.topic)
+            tags = self._generate_tags(req.topic, req.content_type)
+
+            results.append(GeneratedContent(
+                title=title,
+                script=script,
+                description=description,
+                tags=tags,
+                thumbnail_suggestions=self._generate_thumbnail_ideas(req.topic),
+                estimated_duration=self._estimate_duration(script),
+                seo_score=self._calculate_seo_score(title, description, tags)
+            ))
+
+        return results
+
+    def _is_ai_rejection(self, content: str, content_lower: str = None) -> bool:
         """
         Detecta si la IA rechazó generar el contenido solicitado con patrones mejorados.
-        
+
         Args:
             content: Respuesta de la IA
-            
+            content_lower: Versión en minúsculas ya calculada (opcional, evita recalcular)
+
         Returns:
             bool: True si es un rechazo
         """
         if not content or not isinstance(content, str):
             return True
-            
-        content_lower = content.lower().strip()
-        
-        # Lista expandida de frases de rechazo (incluye el caso reportado por el usuario)
-        rejection_phrases = [
-            # Spanish rejections - Basic
-            "no puedo generar contenido",
-            "no puedo crear contenido", 
-            "lo siento, pero no",
-            "lo siento pero no",
-            "lo siento, no puedo",
-            "lo siento pero no puedo",  # Patrón específico reportado
-            "lo siento pero no puedo generar",
-            "lo siento pero no puedo generar contenido",
-            "lo siento pero no puedo generar contenido sobre",
-            
-            # Specific content types that get rejected
-            "contenido sobre fakis",     # Caso específico reportado por usuario
-            "contenido sobre deepfakes",
-            "contenido sobre suplementos",
-            "promoción de alimentos",
-            "promoción de suplementos",
-            "contenido relacionado con la promoción",
-            "contenido que promueva",
-            
-            # Other Spanish rejection patterns
-            "no es apropiado",
-            "no puedo proporcionar",
-            "no puedo ayudar",
-            "no está permitido",
-            "no es recomendable",
-            "evitar la promoción",
-            "no puedo generar",
-            "no puedo crear",
-            "no puedo escribir",
-            "¿en qué puedo ayudarte?",
-            "en qué puedo ayudarte",
-            "como modelo de lenguaje",
-            "como ia no puedo",
-            "mi programación no me permite",
-            
-            # English rejections
-            "sorry, i can't",
-            "i cannot generate",
-            "i'm not able to",
-            "i can't create",
-            "i cannot create",
-            "i'm sorry, but",
-            "i apologize, but",
-            "i can't generate content",
-            "i cannot generate content about",
-            "as an ai, i cannot",
-            "as a language model",
-            "against my programming"
-        ]
-        
-        # Check for rejection phrases
-        for phrase in rejection_phrases:
-            if phrase in content_lower:
-                logger.warning(f"🚫 Contenido rechazado detectado - Frase: '{phrase}' en: '{content_lower[:200]}...'")
-                return True
+
+        if content_lower is None:
+            content_lower = content.lower()
+        content_lower = content_lower.strip()
+
+        # Check for rejection phrases (una sola pasada con Aho–Corasick si está disponible)
+        if _contains_any(content_lower, _REJECTION_AC, _REJECTION_PHRASES):
+            logger.warning(f"🚫 Contenido rechazado detectado - Frase de rechazo en: '{content_lower[:200]}...'")
+            return True
         
         # Enhanced pattern detection with regex for more complex patterns
         import re
@@ -481,10 +719,8 @@ class ContentGenerator:
         # Check for high ratio of apology/refusal words
         word_count = len(content.split())
         if word_count > 0:
-            rejection_words = ["sorry", "siento", "disculpa", "apologize", "lamento", 
-                             "puedo", "can't", "cannot", "no", "not"]
-            rejection_word_count = sum(1 for word in content_lower.split() 
-                                     if any(rw in word for rw in rejection_words))
+            rejection_word_count = sum(1 for word in content_lower.split()
+                                     if word.strip(_REJECTION_WORD_TRIM) in _REJECTION_WORDS)
             rejection_ratio = rejection_word_count / word_count
             
             if rejection_ratio > 0.4:  # More than 40% rejection-related words
@@ -599,55 +835,49 @@ THUMBNAIL: Texto grande con números, expresión de sorpresa, colores llamativos
         
         return fallback_content
     
-    def _extract_title(self, script: str) -> str:
+    def _extract_title(self, script: str, script_lower: str = None) -> str:
         """Extrae el título del guión generado con mejor detección de rechazos."""
         if not script or not isinstance(script, str):
             return "TOP 5 - Contenido Increíble"
-            
+
         # PROTECCIÓN: Si el script contiene frases de rechazo, usar título por defecto
-        script_lower = script.lower()
-        rejection_indicators = [
-            "lo siento", "no puedo", "i'm sorry", "i can't", 
-            "contenido sobre", "generar contenido", "crear contenido"
-        ]
-        
-        if any(indicator in script_lower for indicator in rejection_indicators):
+        if script_lower is None:
+            script_lower = script.lower()
+
+        if any(indicator in script_lower for indicator in _REJECTION_INDICATORS):
             logger.warning(f"🚫 Título extraído de contenido con rechazo detectado - Usando título por defecto")
             return "🚀 TOP 5 Datos Increíbles Que Te Sorprenderán"
-        
-        lines = script.split('\n')
+
+        lines = script.splitlines()
         for line in lines:
             if 'título' in line.lower() or 'title' in line.lower():
                 # Buscar después de dos puntos
                 if ':' in line:
                     title = line.split(':', 1)[1].strip().strip('"\'')
                     # Verificar que el título extraído no sea un rechazo
-                    if not any(indicator in title.lower() for indicator in rejection_indicators):
+                    if not any(indicator in title.lower() for indicator in _REJECTION_INDICATORS):
                         return title
-        
+
         # Fallback: primera línea no vacía que no sea un rechazo
         for line in lines:
-            if (line.strip() and 
-                not line.startswith('#') and 
-                not any(indicator in line.lower() for indicator in rejection_indicators)):
+            if (line.strip() and
+                not line.startswith('#') and
+                not any(indicator in line.lower() for indicator in _REJECTION_INDICATORS)):
                 return line.strip()[:100]  # Máximo 100 chars
         
         # Último recurso: título por defecto
         return "🚀 TOP 5 Datos Increíbles Que Te Sorprenderán"
     
-    def _extract_narration(self, script: str) -> str:
+    def _extract_narration(self, script: str, script_lower: str = None) -> str:
         """Extrae SOLO la narración pura del contenido generado con protección contra rechazos."""
         if not script or not isinstance(script, str):
             return "Descubre datos increíbles que te sorprenderán. ¡Contenido educativo y entretenido!"
-            
+
         # PROTECCIÓN: Si el script contiene frases de rechazo, usar narración por defecto
-        script_lower = script.lower()
-        rejection_indicators = [
-            "lo siento", "no puedo", "i'm sorry", "i can't", 
-            "contenido sobre", "generar contenido", "crear contenido"
-        ]
-        
-        if any(indicator in script_lower for indicator in rejection_indicators):
+        if script_lower is None:
+            script_lower = script.lower()
+
+        if any(indicator in script_lower for indicator in _REJECTION_INDICATORS):
             logger.warning(f"🚫 Narración extraída de contenido con rechazo detectado - Usando narración por defecto")
             return """¿Sabías que existen datos increíbles que la mayoría de personas no conoce? 
             Hoy te traigo curiosidades que cambiarán tu perspectiva del mundo.
@@ -660,21 +890,16 @@ THUMBNAIL: Texto grande con números, expresión de sorpresa, colores llamativos
             
             ¿Cuál te sorprendió más? ¡Déjamelo en los comentarios y sígueme para más curiosidades increíbles!"""
         
-        # Buscar la sección de NARRACIÓN con diferentes formatos
-        import re
-        
-        # Patrón para encontrar la sección NARRACIÓN
-        narration_pattern = r'\*{0,2}NARRACIÓN\*{0,2}:?\s*(["\"]?)([^"]*?)\1(?=\*{0,2}DESCRIPCIÓN|\*{0,2}TAGS|\*{0,2}THUMBNAIL|$)'
-        
-        match = re.search(narration_pattern, script, re.IGNORECASE | re.DOTALL)
+        # Buscar la sección de NARRACIÓN con diferentes formatos (patrón precompilado)
+        match = _NARRATION_SECTION_RE.search(script)
         if match:
             narration = match.group(2).strip()
             # Limpiar asteriscos y caracteres extra
-            narration = re.sub(r'\*{2,}', '', narration)
+            narration = _ASTERISK_RUN_RE.sub('', narration)
             narration = narration.strip()
-            
+
             # Verificar que la narración extraída no sea un rechazo
-            if not any(indicator in narration.lower() for indicator in rejection_indicators):
+            if not any(indicator in narration.lower() for indicator in _REJECTION_INDICATORS):
                 return narration
             else:
                 logger.warning(f"🚫 Narración extraída contiene rechazo - Usando narración por defecto")
@@ -683,7 +908,7 @@ THUMBNAIL: Texto grande con números, expresión de sorpresa, colores llamativos
                 ¡Sígueme para más contenido increíble que te dejará sin palabras!"""
         
         # Fallback: si no encuentra NARRACIÓN, buscar patrones comunes
-        lines = script.split('\n')
+        lines = script.splitlines()
         narration_lines = []
         capturing = False
         
@@ -691,7 +916,7 @@ THUMBNAIL: Texto grande con números, expresión de sorpresa, colores llamativos
             line = line.strip()
             
             # Empezar a capturar después de NARRACIÓN, GUIÓN, etc.
-            if any(keyword in line.lower() for keyword in ['narración:', 'guión:', '**narración**']):
+            if _NARRATION_START_RE.search(line):
                 capturing = True
                 # Si hay contenido después de los dos puntos, incluirlo
                 if ':' in line:
@@ -700,8 +925,9 @@ THUMBNAIL: Texto grande con números, expresión de sorpresa, colores llamativos
                         narration_lines.append(content_after)
                 continue
             
-            # Parar de capturar en la siguiente sección
-            if capturing and line and any(line.lower().startswith(keyword) for keyword in ['**descripción', '**tags', '**thumbnail', 'descripción:', 'tags:', 'thumbnail:']):
+            # Parar de capturar en la siguiente sección (startswith acepta
+            # una tupla y resuelve los 6 prefijos en una sola llamada C)
+            if capturing and line and line.lower().startswith(_NARRATION_STOP_PREFIXES):
                 break
             
             # Capturar líneas de narración (evitar líneas con solo asteriscos)
@@ -717,26 +943,13 @@ THUMBNAIL: Texto grande con números, expresión de sorpresa, colores llamativos
         # Si no encontró nada, usar todo el script como fallback
         return script
     
-    def _generate_description(self, script: str, topic: str) -> str:
-        """Genera descripción optimizada para YouTube."""
-        
-        description_prompt = f"""
-        Basándote en este guión de YouTube sobre "{topic}", crea una descripción optimizada:
-
-        GUIÓN:
-        {script[:500]}...
+    def _generate_description(self, script_head: str, topic: str) -> str:
+        """Genera descripción optimizada para YouTube a partir del inicio del guión."""
 
-        REQUISITOS para la descripción:
-        1. Máximo 200 palabras
-        2. Incluir palabras clave SEO
-        3. Call-to-action para suscribirse
-        4. Mencionar contenido relacionado
-        5. Incluir hashtags relevantes
-        6. Tono amigable y profesional
+        description_prompt = _DESCRIPTION_PROMPT_TEMPLATE.format(
+            topic=topic, script_head=script_head
+        )
 
-        DESCRIPCIÓN:
-        """
-        
         # Usar Ollama si está disponible, sino fallback simple
         if self.use_ollama and self.ollama_generator:
             try:
@@ -769,12 +982,11 @@ THUMBNAIL: Texto grande con números, expresión de sorpresa, colores llamativos
                 base_tags.append(word)
         
         # Tags por tipo de contenido
-        if content_type == "TOP_5":
-            base_tags.extend(["ranking", "mejores", "lista"])
-        elif content_type == "CURIOSIDADES":
-            base_tags.extend(["increíble", "sorprendente", "sabías que"])
-        
-        return list(set(base_tags))[:15]  # Máximo 15 tags únicos
+        base_tags.extend(_TOPIC_TYPE_TAGS.get(content_type, ()))
+
+        # dict.fromkeys deduplica preservando el orden (los primeros tags
+        # pesan más para SEO; set() los barajaba en cada llamada)
+        return list(dict.fromkeys(base_tags))[:15]  # Máximo 15 tags únicos
     
     def _generate_thumbnail_ideas(self, topic: str) -> List[str]:
         """Genera ideas para thumbnails."""
@@ -790,33 +1002,21 @@ THUMBNAIL: Texto grande con números, expresión de sorpresa, colores llamativos
     
     def _estimate_duration(self, script: str) -> int:
         """Estima duración en segundos basada en palabras."""
-        # Promedio: 150 palabras por minuto en español
-        words = len(script.split())
+        # Promedio: 150 palabras por minuto en español.
+        # count(' ') + 1 aproxima el nº de palabras sin materializar la
+        # lista completa de tokens que construía split()
+        words = script.count(' ') + 1
         return int((words / 150) * 60)
     
     def _calculate_seo_score(self, title: str, description: str, tags: List[str]) -> float:
-        """Calcula un score básico de SEO (0-100)."""
-        score = 0.0
-        
-        # Título optimizado (30 puntos)
-        if len(title) >= 30 and len(title) <= 70:
-            score += 15
-        if any(keyword in title.lower() for keyword in ["top", "mejor", "increíble"]):
-            score += 15
-        
-        # Descripción optimizada (30 puntos)
-        if len(description) >= 100:
-            score += 15
-        if "suscríbete" in description.lower():
-            score += 15
-        
-        # Tags relevantes (40 puntos)
-        if len(tags) >= 5:
-            score += 20
-        if len(tags) <= 15:
-            score += 20
-        
-        return min(score, 100.0)
+        """Calcula un score básico de SEO (0-100) con la tabla de checks ponderados."""
+        title_lower = title.lower()
+        description_lower = description.lower()
+        score = sum(
+            weight for check, weight in _SEO_CHECKS
+            if check(title_lower, description_lower, tags)
+        )
+        return min(float(score), 100.0)
 
 def quick_generate(topic: str, content_type: str = "TOP_5") -> GeneratedContent:
     """
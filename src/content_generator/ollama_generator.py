@@ -3,12 +3,186 @@ Generador de contenido usando Ollama (IA local gratuita).
 Optimizado para Llama 3.1:8B con soporte GPU GTX 1660Ti.
 """
 
+import asyncio
+import atexit
+import hashlib
 import json
 import logging
+import os
+import re
+import socket
 import subprocess
 import sys
-from typing import Dict, List, Optional
-from dataclasses import dataclass
+import threading
+import time
+from itertools import islice
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+from dataclasses import dataclass, asdict
+
+# Cliente HTTP persistente para hablar con el daemon de Ollama
+# (evita un fork de proceso por petición; el CLI queda como fallback)
+try:
+    import httpx
+    HTTPX_AVAILABLE = True
+except ImportError:
+    HTTPX_AVAILABLE = False
+
+# orjson (Rust + SIMD) acelera ~3-5× el parseo de los cientos de chunks
+# JSON que llegan por streaming; fallback transparente al json estándar
+try:
+    from orjson import loads as _json_loads
+except ImportError:
+    _json_loads = json.loads
+
+# Respeta OLLAMA_HOST si el daemon no corre en el puerto local por defecto
+OLLAMA_BASE_URL = os.environ.get("OLLAMA_HOST", "http://localhost:11434")
+
+# Resultado de la detección de Ollama, compartido entre instancias del
+# proceso: la sonda (socket/CLI) solo se paga una vez
+_OLLAMA_PRESENT: Optional[bool] = None
+
+# Timeouts por operación en vez de 300s planos: un daemon caído o un pool
+# saturado falla en segundos; la lectura (la generación en sí) queda
+# acotada por el presupuesto blando de tokens, no por un número mágico
+if HTTPX_AVAILABLE:
+    _HTTP_TIMEOUT = httpx.Timeout(connect=2.0, read=None, write=5.0, pool=2.0)
+
+# Cliente HTTP síncrono compartido por todo el proceso: un solo pool de
+# conexiones keep-alive aunque se creen varios OllamaGenerator (tests,
+# factories, hilos de worker)
+_HTTP = None
+_HTTP_LOCK = threading.Lock()
+
+
+def _get_client():
+    """Devuelve el httpx.Client compartido (None si httpx no está instalado)."""
+    global _HTTP
+    if not HTTPX_AVAILABLE:
+        return None
+    if _HTTP is None:
+        with _HTTP_LOCK:
+            if _HTTP is None:
+                _HTTP = httpx.Client(base_url=OLLAMA_BASE_URL, timeout=_HTTP_TIMEOUT)
+                atexit.register(_HTTP.close)
+    return _HTTP
+
+# Ritmo de decodificación conservador para dimensionar el presupuesto
+# blando por petición (tokens / ritmo * 2)
+_EXPECTED_TOK_PER_SEC = 10.0
+
+# Presupuesto de salida cuando solo se pide título+narración: la
+# descripción y los tags se derivan localmente sin gastar decodificación
+_NARRATION_NUM_PREDICT = 350
+
+# Caché en disco de respuestas del modelo (reintentos/desarrollo: de
+# segundos a sub-milisegundo en peticiones idénticas)
+OLLAMA_CACHE_DIR = Path(".cache/ollama")
+
+# Patrones precompilados del parser de respuestas: un escaneo C-level
+# sustituye los bucles Python línea a línea
+_TITLE_RE = re.compile(r'(?:T[IÍ]TULO|TITLE)\s*\]?\s*:\s*(.+)', re.IGNORECASE)
+_HASHTAG_RE = re.compile(r'#\w+')
+
+_JSON_HEADERS = {"content-type": "application/json"}
+
+# Plantillas de prompt por idioma/tipo (str.format con {topic}, {custom_prompt},
+# {custom_hook}, {custom_ending}). Hoistadas a módulo: antes cada llamada a
+# generate_shorts_script reconstruía las 4 cadenas multi-KB para usar solo una.
+_SHORTS_PROMPT_TEMPLATES = {
+    "es": {
+        "TOP_5": """{custom_prompt}
+
+🎯 INSTRUCCIONES ESPECÍFICAS PARA SHORTS VIRALES:
+- Duración: 45-75 segundos (óptimo para algoritmo)
+- Formato: TOP 5 ranking dinámico
+- Tono: Impactante, revelador, que genere curiosidad extrema
+- Hook inicial personalizado: "{custom_hook}"
+- Cierre viral: "{custom_ending}"
+
+RESPONDE CON ESTE FORMATO EXACTO:
+
+TÍTULO: [título súper llamativo con emojis que genere clicks]
+
+NARRACIÓN: [SOLO el texto que debe leer el locutor - texto narrativo puro y natural, SIN instrucciones técnicas, SIN descripciones de imágenes, SIN tiempos]
+
+NO generes descripción, tags ni ideas de thumbnail: solo TÍTULO y NARRACIÓN.
+
+ESTRUCTURA NARRATIVA REQUERIDA:
+1. Hook personalizado: "{custom_hook}"
+2. Introducción rápida al tema (5-8 segundos)
+3. TOP 5 elementos en orden ascendente de impacto
+4. Transiciones rápidas entre puntos
+5. Cierre viral: "{custom_ending}"
+
+EJEMPLO DE ESTRUCTURA:
+"{custom_hook} Te voy a revelar el TOP 5 de {topic} que van a cambiar tu perspectiva. En el quinto lugar... [desarrollar]. El cuarto dato es aún más perturbador... [continuar]. El tercero te va a impactar... [continuar]. El segundo lugar es escalofriante... [continuar]. Y el número uno... esto es absolutamente increíble... [clímax]. {custom_ending}"
+
+GENERA TEXTO NARRATIVO PURO - sin instrucciones como 'mostrar imagen X' o 'pausa dramática'.""",
+
+        "CURIOSIDADES": """{custom_prompt}
+
+🎯 FORMATO CURIOSIDADES VIRALES:
+- Hook: "{custom_hook}"
+- 3-5 datos impactantes
+- Cierre: "{custom_ending}"
+- Duración: 30-50 segundos
+
+RESPONDE CON ESTE FORMATO EXACTO:
+
+TÍTULO: [título impactante con emojis]
+
+NARRACIÓN: [SOLO texto para locutor - narrativo puro, SIN instrucciones técnicas]
+
+NO generes descripción, tags ni thumbnails: solo TÍTULO y NARRACIÓN.
+
+ESTRUCTURA:
+"{custom_hook} Te voy a contar datos sobre {topic} que te van a volar la mente. Primer dato: [impactante]. Segundo: [más impactante]. Tercero: [escalofriante]. {custom_ending}"
+
+Genera SOLO texto narrativo puro."""
+    },
+
+    "en": {
+        "TOP_5": """Create a 45-60 second YouTube Short script about "{topic}".
+
+REQUIRED FORMAT:
+- Catchy title (max 60 chars)
+- Powerful hook (3-5 seconds)
+- 5 numbered main points
+- Quick transitions
+- Strong call-to-action
+- Relevant hashtags
+
+STYLE: Energetic, viral, shocking
+DURATION: 45-60 seconds max
+AUDIENCE: 16-35 years English speakers
+
+Generate complete script:""",
+
+        "CURIOSIDADES": """Create viral curiosities content about "{topic}" for YouTube Short.
+
+FORMAT:
+- Shocking title (max 60 chars)
+- Hook intro (Did you know...?)
+- 3-5 incredible numbered facts
+- Surprising ending
+- Viral hashtags
+
+STYLE: Mind-blowing, educational, viral
+DURATION: 30-45 seconds
+
+Generate complete script:"""
+    }
+}
+
+# Builders parcialmente evaluados: el método format_map de cada plantilla,
+# indexado por (idioma, tipo). Una sola búsqueda de dict y una interpolación
+# de los 4 campos dinámicos por llamada; nada del resto se reconstruye.
+_PROMPT_BUILDERS = {
+    (lang, ctype): template.format_map
+    for lang, templates in _SHORTS_PROMPT_TEMPLATES.items()
+    for ctype, template in templates.items()
+}
 
 logger = logging.getLogger(__name__)
 
@@ -20,68 +194,154 @@ class OllamaConfig:
     max_tokens: int = 1000
     top_p: float = 0.9
     repeat_penalty: float = 1.1
+    keep_alive: int = -1  # -1 = modelo pineado en memoria; admite también "30m"
+    num_parallel: int = 4  # Conexiones simultáneas (alinear con OLLAMA_NUM_PARALLEL)
+    num_thread: int = os.cpu_count() or 8  # Hilos del coordinador CPU del servidor
+    num_batch: int = 512  # Microbatch de procesado de prompt (256-512 en CPUs modestas)
+    num_ctx: int = 2048  # Techo de contexto: acota la KV cache y su tráfico de memoria
+    json_format: bool = False  # format=json: decodificación restringida a JSON válido
 
 class OllamaGenerator:
     """Generador de contenido usando Ollama local."""
     
     def __init__(self, config: OllamaConfig = None):
         self.config = config or OllamaConfig()
-        self.available_models = []
-        self.is_installed = self._check_ollama_installation()
-        
-        if self.is_installed:
-            self._setup_model()
-    
+        self.available_models = set()  # membership O(1) en el camino caliente
+        # Cliente keep-alive compartido a nivel de módulo: cada instancia
+        # reutiliza el mismo pool de conexiones
+        self._client = _get_client()
+        self._aclient = None  # httpx.AsyncClient, creado perezosamente en la vía async
+        self._sem = None  # asyncio.Semaphore, creado dentro del event loop activo
+        self._aloop = None  # event loop al que están ligados _aclient y _sem
+        # Options de muestreo pre-serializadas (no cambian en toda la sesión);
+        # se deja la llave abierta para añadir el num_ctx por petición
+        self._static_opts_json = json.dumps({
+            "temperature": self.config.temperature,
+            "top_p": self.config.top_p,
+            "repeat_penalty": self.config.repeat_penalty,
+            "num_thread": self.config.num_thread,
+            "num_batch": self.config.num_batch
+        }, separators=(',', ':'))[:-1]
+        # La detección de instalación (sonda HTTP / subprocesos) se difiere al
+        # primer acceso: instanciar el generador vuelve a ser instantáneo
+        self._is_installed = None
+        self._script_cache = {}  # Caché en memoria de scripts ya parseados
+        self._runtime_model = None  # Modelo derivado con sampling horneado (si se crea)
+
+    @property
+    def is_installed(self) -> bool:
+        """Detecta Ollama perezosamente la primera vez que se consulta."""
+        if self._is_installed is None:
+            self._is_installed = self._check_ollama_installation()
+            if self._is_installed:
+                self._setup_model()
+        return self._is_installed
+
+
     def _check_ollama_installation(self) -> bool:
-        """Verifica si Ollama está instalado."""
+        """Verifica si Ollama está disponible (daemon HTTP o CLI)."""
+        global _OLLAMA_PRESENT
+
+        # OLLAMA_HOST explícito: el operador ya sabe dónde corre el daemon,
+        # no hace falta sondear nada
+        if os.environ.get("OLLAMA_HOST"):
+            return True
+
+        if _OLLAMA_PRESENT is not None:
+            return _OLLAMA_PRESENT
+
+        # Preflight barato: un connect TCP (~sub-ms) descarta el caso común
+        # de daemon apagado sin pagar HTTP ni forks de proceso
+        try:
+            socket.create_connection(("127.0.0.1", 11434), timeout=0.5).close()
+            daemon_up = True
+        except OSError:
+            daemon_up = False
+
+        if daemon_up:
+            # La respuesta de /api/tags ya trae la lista de modelos
+            # (ahorra el 'ollama list' posterior)
+            if self._client is not None:
+                try:
+                    r = self._client.get("/api/tags", timeout=1.0)
+                    if r.status_code == 200:
+                        self.available_models = {m["name"] for m in r.json().get("models", [])}
+                except Exception:
+                    pass
+            logger.info("Ollama detectado vía daemon local")
+            _OLLAMA_PRESENT = True
+            return True
+
         try:
             result = subprocess.run(
-                ["ollama", "--version"], 
-                capture_output=True, 
-                text=True, 
+                ["ollama", "--version"],
+                capture_output=True,
+                text=True,
                 timeout=10
             )
             if result.returncode == 0:
                 logger.info(f"Ollama detectado: {result.stdout.strip()}")
+                _OLLAMA_PRESENT = True
                 return True
         except (subprocess.TimeoutExpired, FileNotFoundError):
             logger.warning("Ollama no está instalado")
+        _OLLAMA_PRESENT = False
         return False
     
     def _setup_model(self) -> bool:
         """Configura y descarga el modelo si es necesario."""
         try:
-            # Listar modelos disponibles
-            result = subprocess.run(
-                ["ollama", "list"], 
-                capture_output=True, 
-                text=True, 
-                timeout=30
-            )
-            
-            if result.returncode == 0:
-                self.available_models = self._parse_model_list(result.stdout)
-                logger.info(f"Modelos disponibles: {self.available_models}")
+            # Listar modelos disponibles (solo si la sonda HTTP no los trajo ya)
+            if not self.available_models:
+                self.available_models = self._fetch_available_models()
+            logger.info(f"Modelos disponibles: {sorted(self.available_models)}")
             
             # Verificar si el modelo está disponible
             if self.config.model not in self.available_models:
                 logger.info(f"Descargando modelo {self.config.model}...")
                 self._pull_model(self.config.model)
-            
+
+            # Hornear los parámetros de muestreo en un modelo derivado para
+            # que cada petición viaje solo con el prompt
+            self._ensure_runtime_model()
+
+            # Precargar los pesos en memoria para que la primera generación
+            # real no pague el coste de carga del modelo (varios segundos)
+            self._warmup_model()
+
             return True
             
         except Exception as e:
             logger.error(f"Error configurando modelo: {e}")
             return False
     
-    def _parse_model_list(self, output: str) -> List[str]:
-        """Parsea la lista de modelos de Ollama."""
-        models = []
-        for line in output.split('\n')[1:]:  # Skip header
-            if line.strip():
-                model_name = line.split()[0]
-                if model_name and model_name != "NAME":
-                    models.append(model_name)
+    def _fetch_available_models(self) -> set:
+        """Obtiene los modelos instalados: JSON de /api/tags, CLI como fallback."""
+        if self._client is not None:
+            try:
+                r = self._client.get("/api/tags")
+                r.raise_for_status()
+                return {m["name"] for m in r.json().get("models", [])}
+            except Exception as e:
+                logger.debug(f"/api/tags no disponible ({e}), usando CLI")
+
+        # Fallback: parsear la salida de 'ollama list' (frágil, último recurso)
+        models = set()
+        try:
+            result = subprocess.run(
+                ["ollama", "list"],
+                capture_output=True,
+                text=True,
+                timeout=30
+            )
+            if result.returncode == 0:
+                for line in result.stdout.splitlines()[1:]:  # Skip header
+                    if line.strip():
+                        model_name = line.split()[0]
+                        if model_name and model_name != "NAME":
+                            models.add(model_name)
+        except (subprocess.TimeoutExpired, FileNotFoundError) as e:
+            logger.warning(f"No se pudo listar modelos: {e}")
         return models
     
     def _pull_model(self, model: str) -> bool:
@@ -97,7 +357,7 @@ class OllamaGenerator:
             
             if process.returncode == 0:
                 logger.info(f"Modelo {model} descargado exitosamente")
-                self.available_models.append(model)
+                self.available_models.add(model)
                 return True
             else:
                 logger.error(f"Error descargando modelo: {process.stderr}")
@@ -110,40 +370,309 @@ class OllamaGenerator:
             logger.error(f"Error inesperado descargando modelo: {e}")
             return False
     
-    def generate_content(self, prompt: str) -> Optional[str]:
+    def _ensure_runtime_model(self) -> None:
+        """Crea (una vez) un modelo derivado con los PARAMETER de muestreo fijos.
+
+        Con el sampling horneado vía Modelfile, el servidor no re-inicializa
+        el estado del sampler por petición y una discrepancia de options no
+        puede desalojar al runner cacheado.
+        """
+        if self._client is None or self._runtime_model is not None:
+            return
+        derived_name = f"{self.config.model.replace(':', '-')}-shorts"
+        modelfile = (
+            f"FROM {self.config.model}\n"
+            f"PARAMETER temperature {self.config.temperature}\n"
+            f"PARAMETER top_p {self.config.top_p}\n"
+            f"PARAMETER repeat_penalty {self.config.repeat_penalty}\n"
+            f"PARAMETER num_predict {self.config.max_tokens}\n"
+            f"PARAMETER num_thread {self.config.num_thread}\n"
+            f"PARAMETER num_batch {self.config.num_batch}\n"
+        )
+        try:
+            r = self._client.post("/api/create", json={"name": derived_name, "modelfile": modelfile})
+            r.raise_for_status()
+            self._runtime_model = derived_name
+            self.available_models.add(derived_name)
+            logger.info(f"🏷️ Modelo derivado listo: {derived_name}")
+        except Exception as e:
+            # Sin modelo derivado se sigue enviando options por petición
+            logger.debug(f"No se pudo crear el modelo derivado: {e}")
+
+    def _warmup_model(self) -> None:
+        """Pide al daemon que cargue el modelo sin generar nada (warmup)."""
+        if self._client is None:
+            return
+        try:
+            self._client.post("/api/generate", json={
+                "model": self._runtime_model or self.config.model,
+                "prompt": "",
+                "keep_alive": self.config.keep_alive
+            })
+            logger.info(f"🔥 Modelo {self.config.model} precargado en memoria")
+        except Exception as e:
+            logger.debug(f"Warmup del modelo omitido: {e}")
+
+    def _cache_key(self, prompt: str) -> str:
+        """Clave de caché: hash del prompt + configuración de muestreo."""
+        config_json = json.dumps(asdict(self.config), sort_keys=True)
+        return hashlib.blake2b((prompt + config_json).encode('utf-8')).hexdigest()
+
+    def _cache_load(self, key: str) -> Optional[str]:
+        """Lee una respuesta cacheada del disco (None si no existe)."""
+        try:
+            path = OLLAMA_CACHE_DIR / f"{key}.txt"
+            if path.is_file():
+                return path.read_text(encoding='utf-8')
+        except OSError:
+            pass
+        return None
+
+    def _cache_store(self, key: str, response: str) -> None:
+        """Guarda una respuesta en la caché de disco (best-effort)."""
+        try:
+            OLLAMA_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+            (OLLAMA_CACHE_DIR / f"{key}.txt").write_text(response, encoding='utf-8')
+        except OSError as e:
+            logger.debug(f"No se pudo guardar en caché: {e}")
+
+    def clear_cache(self) -> int:
+        """Borra la caché de respuestas. Retorna cuántas entradas eliminó."""
+        removed = 0
+        try:
+            for entry in OLLAMA_CACHE_DIR.glob("*.txt"):
+                entry.unlink()
+                removed += 1
+        except OSError as e:
+            logger.warning(f"Error limpiando caché: {e}")
+        return removed
+
+    def _serialize_request_body(self, prompt: str, stream: bool = False,
+                                num_predict: Optional[int] = None) -> str:
+        """Serializa el cuerpo de /api/generate reutilizando las options estáticas."""
+        # num_predict viaja por llamada: la decodificación es O(tokens de
+        # salida), así que pedir solo la narración recorta latencia real
+        if num_predict is None:
+            num_predict = self.config.max_tokens
+        # Contexto ajustado al prompt real (redondeado a 128): una KV-cache
+        # más pequeña acelera el prefill y libera VRAM en GPUs de 6 GB.
+        # Nota: NO se fija num_gpu — en Ollama significa "número de capas a
+        # descargar en GPU", y forzarlo a 1 dejaba casi todo el modelo en CPU;
+        # el auto-offload del daemon elige el reparto óptimo.
+        estimated_tokens = len(prompt) // 3 + num_predict + 64
+        # config.num_ctx actúa de techo: prompts largos no inflan la KV cache
+        num_ctx = min(self.config.num_ctx, (estimated_tokens + 127) // 128 * 128)
+
+        format_fragment = ',"format":"json"' if self.config.json_format else ''
+
+        # Con modelo derivado el sampling ya va horneado: payload mínimo
+        if self._runtime_model is not None:
+            return (
+                '{"model":' + json.dumps(self._runtime_model)
+                + ',"prompt":' + json.dumps(prompt)
+                + ',"stream":' + ('true' if stream else 'false')
+                + ',"keep_alive":' + json.dumps(self.config.keep_alive)
+                + format_fragment
+                + ',"options":{"num_ctx":' + str(num_ctx)
+                + ',"num_predict":' + str(num_predict) + '}}'
+            )
+
+        # Solo el prompt pasa por json.dumps; el resto es concatenación de
+        # fragmentos ya serializados en __init__
+        return (
+            '{"model":' + json.dumps(self.config.model)
+            + ',"prompt":' + json.dumps(prompt)
+            + ',"stream":' + ('true' if stream else 'false')
+            + ',"keep_alive":' + json.dumps(self.config.keep_alive)
+            + format_fragment
+            + ',"options":' + self._static_opts_json
+            + ',"num_ctx":' + str(num_ctx)
+            + ',"num_predict":' + str(num_predict) + '}}'
+        )
+
+    async def agenerate_content(self, prompt: str) -> Optional[str]:
+        """
+        Versión asíncrona de generate_content vía /api/generate.
+
+        Permite lanzar varias generaciones independientes en paralelo con
+        asyncio.gather (el servidor las atiende en paralelo si se arranca
+        con OLLAMA_NUM_PARALLEL > 1).
+        """
+        if not HTTPX_AVAILABLE:
+            logger.error("httpx no disponible para la vía asíncrona")
+            return None
+
+        if not self.is_installed:
+            logger.error("Ollama no está instalado")
+            return None
+
+        # Cliente y semáforo ligados al loop activo: asyncio.run (vía
+        # generate_contents) crea un loop nuevo por llamada, y reutilizar un
+        # Semaphore o las conexiones de un loop ya cerrado rompe con
+        # "bound to a different event loop" en la segunda pasada
+        loop = asyncio.get_running_loop()
+        if self._aclient is None or self._aloop is not loop:
+            if self._aclient is not None:
+                # Las conexiones del cliente anterior murieron con su loop;
+                # solo queda soltar la referencia
+                try:
+                    await self._aclient.aclose()
+                except Exception:
+                    pass
+            self._aclient = httpx.AsyncClient(
+                base_url=OLLAMA_BASE_URL,
+                timeout=_HTTP_TIMEOUT,
+                limits=httpx.Limits(max_connections=self.config.num_parallel)
+            )
+            # Semáforo alineado con los slots reales del servidor: despachar
+            # más peticiones que OLLAMA_NUM_PARALLEL solo genera colas y
+            # head-of-line blocking en el daemon
+            self._sem = asyncio.Semaphore(int(os.environ.get("OLLAMA_NUM_PARALLEL", "1")))
+            self._aloop = loop
+
+        # Presupuesto blando proporcional a los tokens pedidos: una petición
+        # atascada se cancela y devuelve None sin congelar el resto del batch
+        budget = self.config.max_tokens / _EXPECTED_TOK_PER_SEC * 2
+
+        try:
+            async with self._sem:
+                r = await asyncio.wait_for(
+                    self._aclient.post("/api/generate",
+                                       content=self._serialize_request_body(prompt),
+                                       headers=_JSON_HEADERS),
+                    timeout=budget
+                )
+            r.raise_for_status()
+            response = _json_loads(r.content)["response"].strip()
+            logger.info(f"Contenido generado exitosamente ({len(response)} caracteres)")
+            return response
+        except asyncio.TimeoutError:
+            logger.error(f"⚠️ Generación cancelada tras {budget:.0f}s (presupuesto agotado)")
+            return None
+        except RuntimeError:
+            # Recurso ligado a otro event loop: es un bug de uso, no un fallo
+            # transitorio del servidor; propagarlo en vez de devolver None
+            raise
+        except Exception as e:
+            logger.error(f"Error generando contenido (async): {e}")
+            return None
+
+    async def agenerate_contents(self, prompts: List[str]) -> List[Optional[str]]:
+        """
+        Genera varios prompts en paralelo (una corrutina por prompt).
+
+        Con OLLAMA_NUM_PARALLEL > 1 en el servidor el throughput escala casi
+        linealmente hasta agotar los slots; incluso con 1 slot se solapa el
+        overhead HTTP/cliente de cada petición.
+
+        Args:
+            prompts: Lista de prompts independientes
+
+        Returns:
+            list: Una respuesta (o None) por prompt, en el mismo orden
+        """
+        return list(await asyncio.gather(*(self.agenerate_content(p) for p in prompts)))
+
+    def generate_contents(self, prompts: List[str]) -> List[Optional[str]]:
+        """Wrapper síncrono de agenerate_contents para callers sin event loop."""
+        return asyncio.run(self.agenerate_contents(prompts))
+
+    def generate_content(self, prompt: str, nocache: bool = False,
+                         on_token: Optional[Callable[[str], None]] = None,
+                         num_predict: Optional[int] = None) -> Optional[str]:
         """
         Genera contenido usando Ollama.
-        
+
         Args:
             prompt: Prompt para la generación
-            
+            nocache: True para forzar una generación nueva (reruns creativos)
+            on_token: Callback opcional que recibe cada fragmento según llega
+                      (permite solapar parseo/TTS con la generación)
+            num_predict: Presupuesto de tokens de salida para esta llamada
+                         (por defecto, config.max_tokens)
+
         Returns:
             str: Contenido generado o None si hay error
         """
+        # Caché en disco: un hit evita por completo el HTTP/subproceso
+        cache_key = None
+        if not nocache:
+            cache_key = self._cache_key(prompt)
+            cached = self._cache_load(cache_key)
+            if cached is not None:
+                logger.info(f"💾 Respuesta servida desde caché ({len(cached)} caracteres)")
+                if on_token is not None:
+                    on_token(cached)
+                return cached
+
         if not self.is_installed:
             logger.error("Ollama no está instalado")
             return None
         
         if self.config.model not in self.available_models:
-            logger.error(f"Modelo {self.config.model} no disponible")
-            return None
+            # El modelo pudo instalarse tras el arranque: refrescar una vez
+            # desde /api/tags antes de rendirse
+            self.available_models = self._fetch_available_models()
+            if self.config.model not in self.available_models:
+                logger.error(f"Modelo {self.config.model} no disponible")
+                return None
         
         try:
-            # Preparar comando Ollama
-            ollama_prompt = {
-                "model": self.config.model,
-                "prompt": prompt,
-                "stream": False,
-                "options": {
-                    "temperature": self.config.temperature,
-                    "num_predict": self.config.max_tokens,
-                    "top_p": self.config.top_p,
-                    "repeat_penalty": self.config.repeat_penalty,
-                    "num_gpu": 1  # Usar GPU si está disponible
-                }
-            }
-            
-            # Ejecutar Ollama con el comando correcto y encoding UTF-8
+            # Vía preferida: API HTTP del daemon (sin fork y respetando options).
+            # Streaming: se acumulan los trozos en una lista y se unen al final
+            # (evita mantener la respuesta duplicada en memoria y permite
+            # cortar en cuanto llega "done").
+            if self._client is not None:
+                try:
+                    body = self._serialize_request_body(prompt, stream=True,
+                                                        num_predict=num_predict)
+                    # Presupuesto de pared también en la vía síncrona: con
+                    # read=None un modelo atascado cargando (cero bytes) nos
+                    # colgaría para siempre. El timeout por lectura corta el
+                    # socket mudo y el deadline acota la generación completa
+                    budget = (num_predict or self.config.max_tokens) / _EXPECTED_TOK_PER_SEC * 2
+                    deadline = time.monotonic() + budget
+                    parts = []
+                    with self._client.stream(
+                            "POST", "/api/generate",
+                            content=body, headers=_JSON_HEADERS,
+                            timeout=httpx.Timeout(connect=2.0, read=30.0,
+                                                  write=5.0, pool=2.0)) as r:
+                        r.raise_for_status()
+                        for line in r.iter_lines():
+                            if time.monotonic() > deadline:
+                                logger.error(f"⚠️ Generación cancelada tras {budget:.0f}s "
+                                             "(presupuesto agotado)")
+                                return None
+                            if not line:
+                                continue
+                            chunk = _json_loads(line)
+                            fragment = chunk.get("response", "")
+                            parts.append(fragment)
+                            if on_token is not None and fragment:
+                                on_token(fragment)
+                            if chunk.get("done"):
+                                break
+                    response = "".join(parts).strip()
+                    logger.info(f"Contenido generado exitosamente ({len(response)} caracteres)")
+                    if cache_key is not None:
+                        self._cache_store(cache_key, response)
+                    return response
+                except httpx.TimeoutException:
+                    # Un modelo atascado atascaría igual al CLI: abortar en
+                    # vez de gastar otros 300s en el fallback
+                    logger.error("⚠️ Sin datos del daemon en 30s: generación abortada")
+                    return None
+                except Exception as e:
+                    logger.warning(f"API HTTP de Ollama falló ({e}), usando CLI como fallback")
+
+            # Fallback: ejecutar Ollama CLI con encoding UTF-8.
+            # Nota: es deliberadamente un proceso one-shot por petición. Con
+            # stdin por tubería, 'ollama run' lee hasta EOF y trata todo como
+            # UN prompt (el REPL interactivo requiere un TTY), así que no es
+            # posible mantener un Popen vivo alimentando prompts con
+            # centinelas. El camino caliente es la API HTTP de arriba; este
+            # fallback solo se paga cuando el daemon/httpx no están.
             process = subprocess.run(
                 ["ollama", "run", self.config.model],
                 input=prompt,
@@ -157,6 +686,10 @@ class OllamaGenerator:
             if process.returncode == 0:
                 response = process.stdout.strip()
                 logger.info(f"Contenido generado exitosamente ({len(response)} caracteres)")
+                if cache_key is not None:
+                    self._cache_store(cache_key, response)
+                if on_token is not None:
+                    on_token(response)  # El CLI no streamea: entrega única
                 return response
             else:
                 logger.error(f"Error generando contenido: {process.stderr}")
@@ -184,126 +717,188 @@ class OllamaGenerator:
             dict: Script estructurado para Shorts
         """
         
+        # Caché del resultado YA parseado (memoria + disco): repetir un tema
+        # idéntico no vuelve a tocar el LLM ni el parser
+        cache_key = hashlib.blake2b(
+            f"{self.config.model}|{language}|{content_type}|{topic}|"
+            f"{json.dumps(topic_data, sort_keys=True)}|{self.config.temperature}".encode('utf-8')
+        ).hexdigest()
+
+        cached = self._script_cache.get(cache_key)
+        if cached is not None:
+            return dict(cached)
+
+        cache_path = OLLAMA_CACHE_DIR / "scripts" / f"{cache_key}.json"
+        try:
+            if cache_path.is_file():
+                result = json.loads(cache_path.read_text(encoding='utf-8'))
+                self._script_cache[cache_key] = result
+                logger.info(f"💾 Script servido desde caché: '{topic}'")
+                return dict(result)
+        except (OSError, json.JSONDecodeError):
+            pass  # Entrada corrupta o ilegible: regenerar
+
         # 🎯 SISTEMA DE PROMPTS VARIABLES Y DINÁMICOS
-        
+
         # Extraer hook y ending personalizados si están disponibles
         custom_hook = topic_data.get('hook', '¿Sabías que hay secretos que te van a impactar?') if topic_data else '¿Sabías que hay secretos que te van a impactar?'
         custom_ending = topic_data.get('ending', '¿Cuál te impactó más? Déjalo en comentarios.') if topic_data else '¿Cuál te impactó más? Déjalo en comentarios.'
         custom_prompt = topic_data.get('prompt', f'Crea contenido viral sobre {topic}') if topic_data else f'Crea contenido viral sobre {topic}'
         
-        # Prompts optimizados por idioma con variabilidad extrema
-        prompts = {
-            "es": {
-                "TOP_5": f"""{custom_prompt}
+        # Seleccionar builder (mismo orden de fallback que los dicts anidados:
+        # idioma→TOP_5 del idioma→español→TOP_5 español)
+        builder = (_PROMPT_BUILDERS.get((language, content_type))
+                   or _PROMPT_BUILDERS.get((language, "TOP_5"))
+                   or _PROMPT_BUILDERS.get(("es", content_type))
+                   or _PROMPT_BUILDERS[("es", "TOP_5")])
+        prompt = builder({
+            "topic": topic,
+            "custom_prompt": custom_prompt,
+            "custom_hook": custom_hook,
+            "custom_ending": custom_ending
+        })
+
+        # Con format=json se pide un objeto tipado y el parser de texto sobra
+        if self.config.json_format:
+            prompt += ('\n\nRESPONDE ÚNICAMENTE con un objeto JSON con las claves: '
+                       '"title", "narration", "description", "tags" (array), '
+                       '"thumbnail_ideas" (array). Sin texto fuera del JSON.')
+
+        # Generar contenido. El prompt solo pide título+narración, así que
+        # basta un presupuesto de ~350 tokens (vs. 1000): la decodificación
+        # es proporcional a los tokens emitidos
+        raw_content = self.generate_content(prompt, num_predict=_NARRATION_NUM_PREDICT)
 
-🎯 INSTRUCCIONES ESPECÍFICAS PARA SHORTS VIRALES:
-- Duración: 45-75 segundos (óptimo para algoritmo)
-- Formato: TOP 5 ranking dinámico
-- Tono: Impactante, revelador, que genere curiosidad extrema
-- Hook inicial personalizado: "{custom_hook}"
-- Cierre viral: "{custom_ending}"
-
-RESPONDE CON ESTE FORMATO EXACTO:
-
-TÍTULO: [título súper llamativo con emojis que genere clicks]
-
-NARRACIÓN: [SOLO el texto que debe leer el locutor - texto narrativo puro y natural, SIN instrucciones técnicas, SIN descripciones de imágenes, SIN tiempos]
-
-DESCRIPCIÓN: [descripción SEO optimizada para YouTube]
-
-TAGS: [8-10 hashtags virales]
-
-THUMBNAIL: [3 ideas impactantes para miniatura]
-
-ESTRUCTURA NARRATIVA REQUERIDA:
-1. Hook personalizado: "{custom_hook}"
-2. Introducción rápida al tema (5-8 segundos)
-3. TOP 5 elementos en orden ascendente de impacto
-4. Transiciones rápidas entre puntos
-5. Cierre viral: "{custom_ending}"
+        if not raw_content:
+            return None
 
-EJEMPLO DE ESTRUCTURA:
-"{custom_hook} Te voy a revelar el TOP 5 de {topic} que van a cambiar tu perspectiva. En el quinto lugar... [desarrollar]. El cuarto dato es aún más perturbador... [continuar]. El tercero te va a impactar... [continuar]. El segundo lugar es escalofriante... [continuar]. Y el número uno... esto es absolutamente increíble... [clímax]. {custom_ending}"
+        # Parsear y estructurar el contenido (JSON tipado si está activado;
+        # el parser clásico queda como red de seguridad)
+        result = None
+        if self.config.json_format:
+            result = self._parse_json_shorts_content(raw_content, topic)
+        if result is None:
+            result = self._parse_shorts_content(raw_content, topic)
+            self._derive_metadata(result, topic)
+
+        # Guardar en caché (escritura atómica vía os.replace, best-effort)
+        if result:
+            self._script_cache[cache_key] = result
+            try:
+                cache_path.parent.mkdir(parents=True, exist_ok=True)
+                tmp_path = cache_path.with_suffix('.tmp')
+                tmp_path.write_text(json.dumps(result, ensure_ascii=False), encoding='utf-8')
+                os.replace(tmp_path, cache_path)
+            except OSError as e:
+                logger.debug(f"No se pudo cachear el script: {e}")
 
-GENERA TEXTO NARRATIVO PURO - sin instrucciones como 'mostrar imagen X' o 'pausa dramática'.""",
-                
-                "CURIOSIDADES": f"""{custom_prompt}
+        return result
+    
+    def generate_shorts_script_batch(self, topics: List[str], language: str = "es",
+                                     content_type: str = "TOP_5") -> List[Optional[Dict]]:
+        """
+        Genera scripts para varios temas en UNA sola petición al modelo.
 
-🎯 FORMATO CURIOSIDADES VIRALES:
-- Hook: "{custom_hook}"
-- 3-5 datos impactantes
-- Cierre: "{custom_ending}"
-- Duración: 30-50 segundos
+        El prompt combinado amortiza el coste HTTP/prefill entre todos los
+        temas; cada bloque vuelve delimitado por centinelas ###TOPIC_i###.
+        Si algún bloque no aparece en la respuesta, ese tema se regenera
+        individualmente con generate_shorts_script.
 
-RESPONDE CON ESTE FORMATO EXACTO:
+        Args:
+            topics: Lista de temas
+            language: Idioma (es, en, ...)
+            content_type: Tipo de contenido (TOP_5, CURIOSIDADES)
 
-TÍTULO: [título impactante con emojis]
+        Returns:
+            list: Un dict estructurado (o None) por tema, en el mismo orden
+        """
+        if not topics:
+            return []
+        if len(topics) == 1:
+            return [self.generate_shorts_script(topics[0], language, content_type)]
 
-NARRACIÓN: [SOLO texto para locutor - narrativo puro, SIN instrucciones técnicas]
+        numbered_topics = "\n".join(f"{i + 1}) {topic}" for i, topic in enumerate(topics))
+        batch_prompt = f"""Crea {len(topics)} guiones para YouTube Shorts, uno por cada tema listado abajo.
 
-DESCRIPCIÓN: [descripción SEO]
+Para CADA tema escribe un bloque que empiece EXACTAMENTE con la línea ###TOPIC_i### (donde i es el número del tema) seguido de:
 
+TÍTULO: [título llamativo con emojis]
+NARRACIÓN: [SOLO texto narrativo puro para el locutor, SIN instrucciones técnicas]
 TAGS: [hashtags virales]
 
-THUMBNAIL: [3 sugerencias impactantes]
+TEMAS:
+{numbered_topics}
 
-ESTRUCTURA:
-"{custom_hook} Te voy a contar datos sobre {topic} que te van a volar la mente. Primer dato: [impactante]. Segundo: [más impactante]. Tercero: [escalofriante]. {custom_ending}"
+Genera los {len(topics)} bloques completos, en orden."""
 
-Genera SOLO texto narrativo puro."""
-            },
-            
-            "en": {
-                "TOP_5": f"""Create a 45-60 second YouTube Short script about "{topic}".
+        raw_content = self.generate_content(batch_prompt)
 
-REQUIRED FORMAT:
-- Catchy title (max 60 chars)
-- Powerful hook (3-5 seconds)
-- 5 numbered main points
-- Quick transitions
-- Strong call-to-action
-- Relevant hashtags
-
-STYLE: Energetic, viral, shocking
-DURATION: 45-60 seconds max
-AUDIENCE: 16-35 years English speakers
+        # Indexar los bloques devueltos por su centinela
+        blocks = {}
+        if raw_content:
+            parts = re.split(r'###TOPIC_(\d+)###', raw_content)
+            for idx_str, block in zip(parts[1::2], parts[2::2]):
+                blocks[int(idx_str)] = block.strip()
 
-Generate complete script:""",
-                
-                "CURIOSIDADES": f"""Create viral curiosities content about "{topic}" for YouTube Short.
+        results = []
+        for i, topic in enumerate(topics):
+            block = blocks.get(i + 1)
+            if block:
+                results.append(self._parse_shorts_content(block, topic))
+            else:
+                # Fallback: regenerar este tema con una petición individual
+                logger.warning(f"⚠️ Bloque {i + 1} ausente en la respuesta batch, regenerando '{topic}'")
+                results.append(self.generate_shorts_script(topic, language, content_type))
+        return results
 
-FORMAT:
-- Shocking title (max 60 chars)
-- Hook intro (Did you know...?)
-- 3-5 incredible numbered facts
-- Surprising ending
-- Viral hashtags
+    def _parse_json_shorts_content(self, content: str, topic: str) -> Optional[Dict]:
+        """Parsea una respuesta en modo format=json (None si no es JSON usable)."""
+        try:
+            data = _json_loads(content)
+        except Exception:
+            logger.warning("⚠️ Respuesta no es JSON válido, usando parser clásico")
+            return None
+        if not isinstance(data, dict):
+            return None
 
-STYLE: Mind-blowing, educational, viral
-DURATION: 30-45 seconds
+        hashtags = [
+            tag if str(tag).startswith('#') else f"#{tag}"
+            for tag in (data.get("tags") or [])
+        ][:15]
 
-Generate complete script:"""
-            }
+        return {
+            "title": str(data.get("title") or topic.title())[:60],
+            "script": str(data.get("narration") or data.get("script") or content),
+            "hook": "",
+            "main_points": [],
+            "outro": "",
+            "hashtags": hashtags or ["#Shorts", "#Viral", "#Curiosidades", "#DatosIncreibles", "#Sabias"],
+            "estimated_duration": 45,
+            "seo_score": 75,
+            "description": str(data.get("description") or
+                               f"Descubre datos increíbles sobre {topic}. ¡No te pierdas estos datos que te van a sorprender!")
         }
-        
-        # Seleccionar prompt
-        lang_prompts = prompts.get(language, prompts["es"])
-        prompt = lang_prompts.get(content_type, lang_prompts["TOP_5"])
-        
-        # Generar contenido
-        raw_content = self.generate_content(prompt)
-        
-        if not raw_content:
-            return None
-        
-        # Parsear y estructurar el contenido
-        return self._parse_shorts_content(raw_content, topic)
-    
+
+    def _derive_metadata(self, result: Dict, topic: str) -> None:
+        """Deriva descripción y hashtags localmente (el modelo ya no los emite)."""
+        narration = result["script"]
+        marker = narration.find("NARRACIÓN:")
+        if marker != -1:
+            narration = narration[marker + len("NARRACIÓN:"):].strip()
+        snippet = narration[:160].rstrip()
+        if snippet:
+            result["description"] = (f"{snippet}... Descubre más datos increíbles "
+                                     f"sobre {topic}. ¡No te lo pierdas! #Shorts")
+        # Tags del tema + pool estático, dedup conservando orden
+        topic_tags = [f"#{w.capitalize()}" for w in re.findall(r'\w+', topic)[:3]]
+        result["hashtags"] = list(dict.fromkeys(
+            topic_tags + result["hashtags"]
+            + ["#Shorts", "#Viral", "#Curiosidades", "#DatosIncreibles", "#Sabias"]
+        ))[:15]
+
     def _parse_shorts_content(self, content: str, topic: str) -> Dict:
         """Parsea el contenido generado en estructura de Shorts."""
-        
-        lines = [line.strip() for line in content.split('\n') if line.strip()]
-        
+
         result = {
             "title": topic.title(),
             "script": content,
@@ -315,27 +910,24 @@ Generate complete script:"""
             "seo_score": 75,
             "description": f"Descubre datos increíbles sobre {topic}. ¡No te pierdas estos datos que te van a sorprender!"
         }
-        
-        # Intentar extraer título
-        title_indicators = ["[TÍTULO]", "[TITLE]", "TÍTULO:", "TITLE:"]
-        for i, line in enumerate(lines):
-            if any(indicator in line.upper() for indicator in title_indicators):
-                if i + 1 < len(lines):
-                    result["title"] = lines[i + 1][:60]
-                break
-        
-        # Extraer hashtags
-        hashtags = []
-        for line in lines:
-            if line.startswith('#'):
-                hashtags.extend([tag.strip() for tag in line.split() if tag.startswith('#')])
-        
+
+        # Título y hashtags con un escaneo regex C-level cada uno, sin
+        # trocear el contenido en líneas ni bucles Python por token
+        title_match = _TITLE_RE.search(content)
+        if title_match:
+            title = title_match.group(1).strip()
+            if title:
+                result["title"] = title[:60]
+
+        # islice corta el escaneo en el hashtag 15: no se materializan
+        # todas las coincidencias para luego descartarlas
+        hashtags = [m.group(0) for m in islice(_HASHTAG_RE.finditer(content), 15)]
         if hashtags:
-            result["hashtags"] = hashtags[:15]  # Max 15 hashtags
+            result["hashtags"] = hashtags
         else:
             # Hashtags por defecto
             result["hashtags"] = ["#Shorts", "#Viral", "#Curiosidades", "#DatosIncreibles", "#Sabias"]
-        
+
         return result
     
     def get_system_info(self) -> Dict:
@@ -343,7 +935,7 @@ Generate complete script:"""
         return {
             "ollama_installed": self.is_installed,
             "current_model": self.config.model,
-            "available_models": self.available_models,
+            "available_models": sorted(self.available_models),
             "config": {
                 "temperature": self.config.temperature,
                 "max_tokens": self.config.max_tokens,
@@ -371,6 +963,24 @@ def install_ollama_guide() -> str:
 
 ⚡ OPTIMIZACIÓN GPU:
 Ollama detectará automáticamente tu GTX 1660Ti
+
+🔀 PARALELISMO (opcional):
+Por defecto el servidor atiende 1 petición a la vez. Para aprovechar
+las llamadas concurrentes (asyncio.gather), arranca el daemon con:
+   set OLLAMA_NUM_PARALLEL=4
+   set OLLAMA_MAX_LOADED_MODELS=1
+   ollama serve
+
+El cliente lee OLLAMA_NUM_PARALLEL y limita sus peticiones en vuelo a
+ese número: lanzar más solo crearía colas en el servidor.
+
+🧵 AJUSTE CPU (OllamaConfig):
+- num_thread: hilos del coordinador CPU (por defecto, todos los cores)
+- num_batch: microbatch de prompt; 256-512 suele dar 10-30% más tok/s
+  en CPUs modestas
+- num_ctx: ajústalo al prompt más corto viable — un contexto menor
+  reduce el ancho de banda de memoria por token (la KV cache es el
+  cuello memory-bound de la decodificación)
 """
 
 def check_hardware_compatibility() -> Dict:
@@ -391,7 +1001,7 @@ if __name__ == "__main__":
         print(install_ollama_guide())
     else:
         print("✅ Ollama configurado correctamente")
-        print(f"Modelos disponibles: {generator.available_models}")
+        print(f"Modelos disponibles: {sorted(generator.available_models)}")
         
         # Test de generación
         test_script = generator.generate_shorts_script(
@@ -0,0 +1,154 @@
+"""
+Generador de contenido usando vLLM (IA local de alto rendimiento).
+Alternativa a Ollama para servidores con GPU CUDA: pesos INT4 AWQ-Marlin
+y continuous batching (decenas de peticiones concurrentes por GPU).
+"""
+
+import asyncio
+import logging
+import uuid
+from typing import Dict, List, Optional
+from dataclasses import dataclass
+
+from .ollama_generator import (
+    OllamaGenerator, _SHORTS_PROMPT_TEMPLATES, _TITLE_RE, _HASHTAG_RE
+)
+
+try:
+    from vllm import AsyncLLMEngine, SamplingParams
+    from vllm.engine.arg_utils import AsyncEngineArgs
+    VLLM_AVAILABLE = True
+except ImportError:
+    VLLM_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class VLLMConfig:
+    """Configuración optimizada para vLLM con cuantización INT4."""
+    model: str = "casperhansen/llama-3.1-8b-instruct-awq"
+    quantization: str = "awq_marlin"
+    max_num_seqs: int = 24  # Slots de continuous batching
+    temperature: float = 0.8
+    max_tokens: int = 1000
+    top_p: float = 0.9
+
+
+class VLLMGenerator:
+    """Generador local sobre vLLM con la misma interfaz pública que OllamaGenerator."""
+
+    def __init__(self, config: VLLMConfig = None):
+        self.config = config or VLLMConfig()
+        self._engine = None  # AsyncLLMEngine, creado perezosamente
+        self.is_installed = VLLM_AVAILABLE and self._cuda_available()
+
+    @staticmethod
+    def _cuda_available() -> bool:
+        """Verifica si hay GPU CUDA utilizable."""
+        try:
+            import torch
+            return torch.cuda.is_available()
+        except ImportError:
+            return False
+
+    def _ensure_engine(self):
+        """Arranca el motor vLLM una sola vez (carga de pesos INT4)."""
+        if self._engine is None:
+            engine_args = AsyncEngineArgs(
+                model=self.config.model,
+                quantization=self.config.quantization,
+                max_num_seqs=self.config.max_num_seqs,
+                enable_chunked_prefill=True
+            )
+            self._engine = AsyncLLMEngine.from_engine_args(engine_args)
+            logger.info(f"🚀 Motor vLLM inicializado: {self.config.model}")
+        return self._engine
+
+    async def agenerate_content(self, prompt: str) -> Optional[str]:
+        """Genera contenido de forma asíncrona (el motor batchea internamente)."""
+        if not self.is_installed:
+            logger.error("vLLM no está disponible (falta vllm o GPU CUDA)")
+            return None
+
+        try:
+            engine = self._ensure_engine()
+            params = SamplingParams(
+                temperature=self.config.temperature,
+                top_p=self.config.top_p,
+                max_tokens=self.config.max_tokens
+            )
+            final_output = None
+            async for output in engine.generate(prompt, params, request_id=uuid.uuid4().hex):
+                final_output = output
+            if final_output and final_output.outputs:
+                response = final_output.outputs[0].text.strip()
+                logger.info(f"Contenido generado exitosamente ({len(response)} caracteres)")
+                return response
+        except Exception as e:
+            logger.error(f"Error generando con vLLM: {e}")
+        return None
+
+    async def agenerate_contents(self, prompts: List[str]) -> List[Optional[str]]:
+        """Genera varios prompts a la vez; vLLM los decodifica en batch continuo."""
+        return list(await asyncio.gather(*(self.agenerate_content(p) for p in prompts)))
+
+    def generate_content(self, prompt: str) -> Optional[str]:
+        """Wrapper síncrono de agenerate_content."""
+        return asyncio.run(self.agenerate_content(prompt))
+
+    def generate_shorts_script(self, topic: str, language: str = "es",
+                               content_type: str = "TOP_5", topic_data: dict = None) -> Optional[Dict]:
+        """Genera un script para Shorts (mismas plantillas y parseo que Ollama)."""
+        custom_hook = topic_data.get('hook', '¿Sabías que hay secretos que te van a impactar?') if topic_data else '¿Sabías que hay secretos que te van a impactar?'
+        custom_ending = topic_data.get('ending', '¿Cuál te impactó más? Déjalo en comentarios.') if topic_data else '¿Cuál te impactó más? Déjalo en comentarios.'
+        custom_prompt = topic_data.get('prompt', f'Crea contenido viral sobre {topic}') if topic_data else f'Crea contenido viral sobre {topic}'
+
+        lang_templates = _SHORTS_PROMPT_TEMPLATES.get(language, _SHORTS_PROMPT_TEMPLATES["es"])
+        template = lang_templates.get(content_type, lang_templates["TOP_5"])
+        prompt = template.format(
+            topic=topic,
+            custom_prompt=custom_prompt,
+            custom_hook=custom_hook,
+            custom_ending=custom_ending
+        )
+
+        raw_content = self.generate_content(prompt)
+        if not raw_content:
+            return None
+
+        result = {
+            "title": topic.title(),
+            "script": raw_content,
+            "hook": "",
+            "main_points": [],
+            "outro": "",
+            "hashtags": ["#Shorts", "#Viral", "#Curiosidades", "#DatosIncreibles", "#Sabias"],
+            "estimated_duration": 45,
+            "seo_score": 75,
+            "description": f"Descubre datos increíbles sobre {topic}. ¡No te pierdas estos datos que te van a sorprender!"
+        }
+
+        title_match = _TITLE_RE.search(raw_content)
+        if title_match:
+            title = title_match.group(1).strip()
+            if title:
+                result["title"] = title[:60]
+
+        hashtags = _HASHTAG_RE.findall(raw_content)
+        if hashtags:
+            result["hashtags"] = hashtags[:15]
+
+        return result
+
+
+def create_local_generator():
+    """
+    Factory de generador local: vLLM si hay CUDA + vllm instalado
+    (throughput muy superior en batch), Ollama en caso contrario.
+    """
+    if VLLM_AVAILABLE and VLLMGenerator._cuda_available():
+        logger.info("🎯 Backend local seleccionado: vLLM (INT4 + continuous batching)")
+        return VLLMGenerator()
+    logger.info("🎯 Backend local seleccionado: Ollama")
+    return OllamaGenerator()
@@ -5,6 +5,9 @@ Crea videos con plantillas y subtítulos usando timestamps precisos de Whisper
 
 import os
 import logging
+import subprocess
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from pathlib import Path
 from typing import List, Dict, Tuple, Optional
 from PIL import Image, ImageDraw, ImageFont, ImageFilter
@@ -20,21 +23,76 @@ from PIL import Image, ImageDraw, ImageFont, ImageFilter
 import json
 import numpy as np
 
+try:
+    import cv2
+    CV2_AVAILABLE = True
+except ImportError:
+    CV2_AVAILABLE = False
+
+try:
+    from numba import njit, prange
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
 logger = logging.getLogger(__name__)
 
+if NUMBA_AVAILABLE:
+    @njit(parallel=True, fastmath=True, cache=True)
+    def _fill_gradient(out, y_progress, sin_ygrid, cos_ygrid, palette, phase):
+        """
+        Kernel JIT del gradiente: fusiona onda, blend por tramos y cast a
+        uint8 en una sola pasada paralela sin arrays intermedios.
+        """
+        height, width = out.shape[0], out.shape[1]
+        sin_p = np.sin(phase)
+        cos_p = np.cos(phase)
+        for y in prange(height):
+            adj = y_progress[y] + 0.2 * (sin_p * cos_ygrid[y] + cos_p * sin_ygrid[y])
+            if adj < 0.0:
+                adj = 0.0
+            elif adj > 1.0:
+                adj = 1.0
+            if adj < 0.5:
+                blend = adj * 2.0
+                r = palette[0, 0] + (palette[1, 0] - palette[0, 0]) * blend
+                g = palette[0, 1] + (palette[1, 1] - palette[0, 1]) * blend
+                b = palette[0, 2] + (palette[1, 2] - palette[0, 2]) * blend
+            else:
+                blend = (adj - 0.5) * 2.0
+                r = palette[1, 0] + (palette[2, 0] - palette[1, 0]) * blend
+                g = palette[1, 1] + (palette[2, 1] - palette[1, 1]) * blend
+                b = palette[1, 2] + (palette[2, 2] - palette[1, 2]) * blend
+            rv, gv, bv = np.uint8(r), np.uint8(g), np.uint8(b)
+            for x in range(width):
+                out[y, x, 0] = rv
+                out[y, x, 1] = gv
+                out[y, x, 2] = bv
+
+# Geometría de la capa de glow: contorno de 5px (stroke de 4 + halo de 1)
+# y margen suficiente para el radio del GaussianBlur
+_GLOW_STROKE = 5
+_GLOW_PAD = 8
+
 class SimpleVideoCreator:
     """
     Creador de videos simplificado que no depende de MoviePy
     Genera frames individuales que se pueden convertir a video
     """
     
-    def __init__(self):
+    def __init__(self, load_whisper: bool = True, use_cv2_text: bool = False):
         self.video_size = (1080, 1920)  # 9:16 para shorts
         self.fps = 30
-        
-        # Sistema de timestamps precisos con Whisper
+
+        # Camino rápido de texto con OpenCV (tipografía Hershey en vez del
+        # TTF de Windows): varias veces más rápido pero cambia el look, por
+        # eso es opt-in
+        self.use_cv2_text = use_cv2_text and CV2_AVAILABLE
+
+        # Sistema de timestamps precisos con Whisper (los workers de render
+        # no lo necesitan y se saltan la carga del modelo)
         self.whisper_generator = None
-        if WHISPER_AVAILABLE:
+        if WHISPER_AVAILABLE and load_whisper:
             try:
                 self.whisper_generator = PreciseSubtitleGenerator()
                 logger.info("✅ Sistema Whisper inicializado para timestamps precisos")
@@ -50,75 +108,124 @@ class SimpleVideoCreator:
             'energy': [(255, 107, 107), (238, 90, 111), (96, 163, 188)],
             'default': [(67, 126, 234), (118, 75, 162), (240, 147, 251)]
         }
+
+        # Paletas preconvertidas a ndarray float32 (3x3, una fila por color):
+        # el camino caliente del gradiente solo hace un lookup de dict
+        self._palettes = {k: np.asarray(v, dtype=np.float32)
+                          for k, v in self.color_schemes.items()}
+
+        # Caché de fuentes por tamaño: ImageFont.truetype re-parsea el TTF
+        # desde disco en cada llamada y los objetos fuente son inmutables
+        self._font_cache = {}
+
+        # Caché (palabra, ancho_max) -> fuente óptima: a 30 fps cada palabra
+        # se repite ~9 frames seguidos, y la búsqueda con textbbox es redundante
+        self._word_font_cache = {}
+
+        # Caché de capas de glow pre-difuminadas por (palabra, tamaño, color)
+        self._glow_cache = {}
+
+        # Caché del frame base (gradiente+partículas) muestreado grueso
+        self._base_frame_cache = {}
+
+        # Rejillas trigonométricas del gradiente, invariantes entre frames:
+        # con sin/cos(y·2π) precalculados, cada frame solo evalúa 2 senos
+        # escalares (identidad sin(a+b) = sin·cos + cos·sin)
+        self._y_progress = np.linspace(0, 1, self.video_size[1],
+                                       endpoint=False, dtype=np.float32)
+        self._sin_ygrid = np.sin(self._y_progress * 2 * np.pi)
+        self._cos_ygrid = np.cos(self._y_progress * 2 * np.pi)
     
-    def create_gradient_frame(self, scheme_name: str, frame_number: int, total_frames: int) -> Image.Image:
+    def create_gradient_frame(self, palette: np.ndarray, frame_number: int, total_frames: int) -> Image.Image:
         """
-        Crea un frame con gradiente animado
+        Crea un frame con gradiente animado a partir de una paleta ya
+        resuelta (ndarray float32 3x3 de self._palettes)
         """
-        colors = self.color_schemes.get(scheme_name, self.color_schemes['default'])
-        
-        # Crear imagen base
-        img = Image.new('RGB', self.video_size)
-        draw = ImageDraw.Draw(img)
-        
+        colors = palette
+        width, height = self.video_size
+
         # Progreso de animación
         progress = (frame_number / total_frames) % 1.0
-        
-        # Crear gradiente vertical animado
-        for y in range(self.video_size[1]):
-            y_progress = y / self.video_size[1]
-            
-            # Animación con ondas
-            wave_offset = np.sin(progress * 4 * np.pi + y_progress * 2 * np.pi) * 0.2
-            adjusted_progress = max(0, min(1, y_progress + wave_offset))
-            
-            # Interpolación entre colores
-            if adjusted_progress < 0.5:
-                # Color 1 a Color 2
-                blend = adjusted_progress * 2
-                r = int(colors[0][0] + (colors[1][0] - colors[0][0]) * blend)
-                g = int(colors[0][1] + (colors[1][1] - colors[0][1]) * blend)
-                b = int(colors[0][2] + (colors[1][2] - colors[0][2]) * blend)
-            else:
-                # Color 2 a Color 3
-                blend = (adjusted_progress - 0.5) * 2
-                r = int(colors[1][0] + (colors[2][0] - colors[1][0]) * blend)
-                g = int(colors[1][1] + (colors[2][1] - colors[1][1]) * blend)
-                b = int(colors[1][2] + (colors[2][2] - colors[1][2]) * blend)
-            
-            # Dibujar línea horizontal
-            draw.line([(0, y), (self.video_size[0], y)], fill=(r, g, b))
-        
-        # Añadir partículas/efectos
-        self._add_particles(draw, frame_number, total_frames)
-        
-        return img
+
+        # Gradiente vertical animado, vectorizado: el bucle Python de 1920
+        # draw.line (una llamada PIL por scanline) se sustituye por álgebra
+        # NumPy sobre el eje Y completo y un broadcast al ancho
+        phase = progress * 4 * np.pi
+
+        if NUMBA_AVAILABLE:
+            # Kernel fusionado (primera llamada compila; el resto amortiza)
+            frame = np.empty((height, width, 3), dtype=np.uint8)
+            _fill_gradient(frame, self._y_progress, self._sin_ygrid,
+                           self._cos_ygrid, colors, np.float32(phase))
+        else:
+            wave_offset = 0.2 * (np.sin(phase) * self._cos_ygrid
+                                 + np.cos(phase) * self._sin_ygrid)
+            adjusted = np.clip(self._y_progress + wave_offset, 0, 1)
+
+            # Interpolación por tramos: color0→color1 en [0, 0.5), color1→color2 en [0.5, 1]
+            blend_lo = (adjusted * 2)[:, None]
+            blend_hi = ((adjusted - 0.5) * 2)[:, None]
+            rgb_lo = colors[0] + (colors[1] - colors[0]) * blend_lo
+            rgb_hi = colors[1] + (colors[2] - colors[1]) * blend_hi
+            rows = np.where(adjusted[:, None] < 0.5, rgb_lo, rgb_hi).astype(np.uint8)
+
+            frame = np.broadcast_to(rows[:, None, :], (height, width, 3)).copy()
+
+        # Añadir partículas/efectos directamente sobre el buffer NumPy
+        self._add_particles(frame, frame_number, total_frames)
+
+        return Image.fromarray(frame, 'RGB')
     
-    def _add_particles(self, draw: ImageDraw.Draw, frame_number: int, total_frames: int):
+    def _base_frame_for(self, scheme_name: str, frame_num: int, total_frames: int) -> Image.Image:
+        """
+        Frame base muestreado a mitad de cadencia: los frames impares
+        reutilizan el fondo del frame par anterior. A 30 fps el fondo
+        queda efectivamente a 15 fps, imperceptible en un gradiente que
+        se mueve despacio, y la síntesis de fondos se reduce a la mitad.
+        """
+        base_num = frame_num - (frame_num % 2)
+        key = (scheme_name, base_num, total_frames)
+        base_np = self._base_frame_cache.get(key)
+        if base_np is None:
+            # Acotar memoria: cada fondo pesa ~6 MB y los frames llegan en
+            # bloques consecutivos, así que basta un puñado de entradas vivas
+            if len(self._base_frame_cache) >= 8:
+                self._base_frame_cache.clear()
+            # La paleta se resuelve solo al regenerar el fondo, no por frame
+            palette = self._palettes.get(scheme_name, self._palettes['default'])
+            base_np = np.asarray(
+                self.create_gradient_frame(palette, base_num, total_frames),
+                dtype=np.uint8
+            )
+            self._base_frame_cache[key] = base_np
+        # Copia fresca: los subtítulos dibujan in-place sobre el frame
+        return Image.fromarray(base_np.copy(), 'RGB')
+
+    def _add_particles(self, frame: np.ndarray, frame_number: int, total_frames: int):
         """
-        Añade partículas animadas al frame
+        Añade partículas animadas al frame (buffer NumPy HxWx3)
         """
+        width, height = self.video_size
         progress = (frame_number / total_frames) % 1.0
-        
-        # Partículas flotantes
-        for i in range(30):
-            # Posición basada en progreso y seed
-            x = int((np.sin(progress * 2 * np.pi + i * 0.3) * 0.4 + 0.5) * self.video_size[0])
-            y = int(((progress * 100 + i * 80) % (self.video_size[1] + 100)) - 50)
-            
-            if 0 <= x < self.video_size[0] and 0 <= y < self.video_size[1]:
-                # Tamaño y brillo variable (mínimo 1)
-                size = max(1, 2 + int(3 * np.sin(progress * 4 * np.pi + i)))
-                brightness = max(50, min(255, int(150 + 105 * np.sin(progress * 3 * np.pi + i * 0.5))))
-                
-                # Coordenadas válidas
-                x0, y0 = max(0, x-size), max(0, y-size)
-                x1, y1 = min(self.video_size[0]-1, x+size), min(self.video_size[1]-1, y+size)
-                
-                # Dibujar partícula solo si las coordenadas son válidas
-                if x1 > x0 and y1 > y0:
-                    draw.ellipse([x0, y0, x1, y1], 
-                               fill=(brightness, brightness, min(255, brightness + 50)))
+
+        # Geometría de las 30 partículas calculada en bloque: un solo np.sin
+        # vectorizado por atributo en lugar de 30 iteraciones con senos escalares
+        i = np.arange(30)
+        x = ((np.sin(progress * 2 * np.pi + i * 0.3) * 0.4 + 0.5) * width).astype(np.int32)
+        y = (((progress * 100 + i * 80) % (height + 100)) - 50).astype(np.int32)
+        size = np.maximum(1, 2 + (3 * np.sin(progress * 4 * np.pi + i)).astype(np.int32))
+        brightness = np.clip((150 + 105 * np.sin(progress * 3 * np.pi + i * 0.5)).astype(np.int32), 50, 255)
+
+        # Solo las partículas dentro del frame
+        mask = (x >= 0) & (x < width) & (y >= 0) & (y < height)
+
+        # Los sprites son cuadrados de 2-5 px: asignación de slices sobre el
+        # buffer, sin pasar por draw.ellipse por partícula
+        for px, py, ps, pb in zip(x[mask], y[mask], size[mask], brightness[mask]):
+            x0, y0 = max(0, px - ps), max(0, py - ps)
+            x1, y1 = min(width - 1, px + ps), min(height - 1, py + ps)
+            if x1 > x0 and y1 > y0:
+                frame[y0:y1, x0:x1] = (pb, pb, min(255, pb + 50))
     
     def create_subtitle_frame(self, text: str, base_frame: Image.Image, 
                             highlight_word: str = None, all_words: List[str] = None, word_index: int = 0) -> Image.Image:
@@ -126,7 +233,9 @@ class SimpleVideoCreator:
         Añade subtítulos estilo CapCut con highlighting amarillo de palabra actual.
         INTELIGENTE: Ajusta automáticamente para evitar overflow.
         """
-        frame = base_frame.copy()
+        # Se dibuja directamente sobre base_frame: ningún caller lo reutiliza
+        # después y la copia era un memcpy de ~6 MB por frame
+        frame = base_frame
         draw = ImageDraw.Draw(frame)
         
         if not text.strip():
@@ -143,13 +252,13 @@ class SimpleVideoCreator:
         y_position = int(self.video_size[1] * 0.78)  # 78% hacia abajo
         
         # Sistema inteligente de ajuste de fuente y modo
-        font, display_mode, display_words = self._determine_optimal_display(words, highlight_word, max_width, draw)
-        
+        font, text_size, display_mode, display_words = self._determine_optimal_display(words, highlight_word, max_width, draw)
+
         # Determinar si usar amarillo o blanco (alternancia basada en índice)
         use_yellow = (word_index % 2 == 1) if word_index >= 0 else True
-        
+
         # Siempre renderizar una sola palabra perfectamente centrada
-        return self._render_optimized_single_word(frame, display_words[0], highlight_word, font, y_position, use_yellow)
+        return self._render_optimized_single_word(frame, display_words[0], highlight_word, font, text_size, y_position, use_yellow)
     
     def _determine_optimal_display(self, words: List[str], highlight_word: str, max_width: int, draw) -> tuple:
         """
@@ -157,16 +266,16 @@ class SimpleVideoCreator:
         Esto elimina todos los problemas de overflow y posicionamiento.
         
         Returns:
-            tuple: (font, display_mode, display_words)
+            tuple: (font, text_size, display_mode, display_words)
         """
         # Usar solo la palabra destacada
         target_word = highlight_word if highlight_word and highlight_word in words else words[0]
-        
+
         # Encontrar el mejor tamaño de fuente para esta palabra
-        font = self._find_optimal_font_for_text(target_word, max_width, draw)
-        
+        font, text_size = self._find_optimal_font_for_text(target_word, max_width, draw)
+
         logger.debug(f"🎯 Mostrando palabra única: '{target_word}'")
-        return font, "single_word", [target_word]
+        return font, text_size, "single_word", [target_word]
     
     def _select_display_words(self, words: List[str], highlight_word: str) -> tuple:
         """
@@ -223,40 +332,65 @@ class SimpleVideoCreator:
             text: Texto a renderizar
             max_width: Ancho máximo disponible
             draw: Objeto ImageDraw
-            
+
         Returns:
-            Font object
+            tuple: (font, (ancho, alto)) — las medidas ya calculadas se
+                   devuelven para no repetir textbbox al posicionar
         """
+        cached = self._word_font_cache.get((text, max_width))
+        if cached is not None:
+            return cached
+
         # Tamaños de fuente de mayor a menor
         font_sizes = [140, 120, 100, 85, 70, 60, 50, 45]  # Empezamos más grande
-        
+
         for font_size in font_sizes:
             font = self._load_font(font_size)
-            text_width = self._get_text_width(text, font, draw)
-            
-            if text_width <= max_width:
-                logger.debug(f"✅ Fuente óptima: {font_size}px para '{text}' (ancho: {text_width}px)")
-                return font
-        
+            text_size = self._measure_text(text, font, draw)
+
+            if text_size[0] <= max_width:
+                logger.debug(f"✅ Fuente óptima: {font_size}px para '{text}' (ancho: {text_size[0]}px)")
+                result = (font, text_size)
+                self._word_font_cache[(text, max_width)] = result
+                return result
+
         # Fallback: fuente mínima
         logger.debug(f"⚠️ Usando fuente mínima 45px para '{text}'")
-        return self._load_font(45)
+        font = self._load_font(45)
+        result = (font, self._measure_text(text, font, draw))
+        self._word_font_cache[(text, max_width)] = result
+        return result
+
+    def _measure_text(self, text: str, font, draw) -> tuple:
+        """
+        Mide (ancho, alto) del texto de forma segura.
+        """
+        try:
+            bbox = draw.textbbox((0, 0), text, font=font)
+            return max(0, bbox[2] - bbox[0]), max(0, bbox[3] - bbox[1])
+        except:
+            try:
+                return int(draw.textlength(text, font=font)), getattr(font, 'size', 20)
+            except:
+                return len(text) * 20, 20  # Fallback estimado
     
 
     
-    def _render_optimized_single_word(self, frame: Image.Image, word: str, 
-                                    highlight_word: str, font, y_position: int, use_yellow: bool = True) -> Image.Image:
+    def _render_optimized_single_word(self, frame: Image.Image, word: str,
+                                    highlight_word: str, font, text_size: tuple,
+                                    y_position: int, use_yellow: bool = True) -> Image.Image:
         """
         Renderiza UNA sola palabra PERFECTAMENTE CENTRADA con alternancia amarillo/blanco.
         Sistema profesional con stroke y efectos visuales.
         """
+        if self.use_cv2_text:
+            return self._render_word_cv2(frame, word, use_yellow)
+
         draw = ImageDraw.Draw(frame)
-        
-        # Calcular dimensiones del texto
-        text_bbox = draw.textbbox((0, 0), word, font=font)
-        text_width = text_bbox[2] - text_bbox[0]
-        text_height = text_bbox[3] - text_bbox[1]
-        
+
+        # Dimensiones ya medidas durante la búsqueda de fuente
+        text_width, text_height = text_size
+
         # CENTRADO PERFECTO: horizontal y vertical
         x_position = (frame.width - text_width) // 2
         y_position = (frame.height - text_height) // 2  # Centrar verticalmente
@@ -275,29 +409,79 @@ class SimpleVideoCreator:
         
         border_color = (0, 0, 0)  # Negro profundo
         
-        # EFECTO GLOW SUTIL (opcional)
-        glow_thickness = 1
-        for dx in range(-glow_thickness, glow_thickness + 1):
-            for dy in range(-glow_thickness, glow_thickness + 1):
-                if dx != 0 or dy != 0:
-                    draw.text((x_position + dx, y_position + dy), word, 
-                             font=font, fill=glow_color)
-        
-        # STROKE NEGRO GRUESO para máximo contraste
+        # EFECTO GLOW SUTIL: capa RGBA pre-difuminada y cacheada por palabra;
+        # una misma palabra se muestra durante muchos frames, así que el
+        # blur solo se paga una vez y cada frame hace un único paste con alfa
         stroke_thickness = 4
-        for dx in range(-stroke_thickness, stroke_thickness + 1):
-            for dy in range(-stroke_thickness, stroke_thickness + 1):
-                if dx != 0 or dy != 0:
-                    draw.text((x_position + dx, y_position + dy), word, 
-                             font=font, fill=border_color)
-        
-        # TEXTO PRINCIPAL con color alternante
-        draw.text((x_position, y_position), word, font=font, fill=text_color)
+        glow_layer, glow_dx, glow_dy = self._make_glow_layer(word, font, glow_color)
+        frame.paste(glow_layer, (x_position + glow_dx, y_position + glow_dy), glow_layer)
+
+        # STROKE NEGRO GRUESO + TEXTO PRINCIPAL: el stroke nativo de Pillow
+        # dibuja el contorno en C con una única rasterización del glifo,
+        # frente a las (2·grosor+1)² re-rasterizaciones del bucle anterior
+        draw.text((x_position, y_position), word, font=font, fill=text_color,
+                  stroke_width=stroke_thickness, stroke_fill=border_color)
         
         logger.debug(f"🎯 Palabra {effect_name} centrada: '{word}' en ({x_position}, {y_position})")
         return frame
     
-    def _render_optimized_two_words(self, frame: Image.Image, display_words: List[str], 
+    def _render_word_cv2(self, frame: Image.Image, word: str, use_yellow: bool) -> Image.Image:
+        """
+        Camino rápido con OpenCV: stroke y relleno con dos cv2.putText
+        in-place sobre el ndarray, sin pasar por el rasterizador de PIL.
+        """
+        arr = np.array(frame, dtype=np.uint8)
+        font = cv2.FONT_HERSHEY_DUPLEX
+        max_width = self.video_size[0] - 160
+
+        # Búsqueda de tamaño por división directa sobre el ancho medido
+        scale = 4.0
+        (text_width, text_height), _ = cv2.getTextSize(word, font, scale, 8)
+        if text_width > max_width:
+            scale *= max_width / text_width
+            (text_width, text_height), _ = cv2.getTextSize(word, font, scale, 8)
+
+        x = (arr.shape[1] - text_width) // 2
+        y = (arr.shape[0] + text_height) // 2  # putText posiciona la baseline
+        text_color = (255, 223, 0) if use_yellow else (255, 255, 255)
+
+        cv2.putText(arr, word, (x, y), font, scale, (0, 0, 0),
+                    thickness=8, lineType=cv2.LINE_AA)
+        cv2.putText(arr, word, (x, y), font, scale, text_color,
+                    thickness=2, lineType=cv2.LINE_AA)
+        return Image.fromarray(arr, 'RGB')
+
+    def _make_glow_layer(self, word: str, font, glow_color) -> tuple:
+        """
+        Construye (y memoiza) la capa de glow de una palabra: el texto con
+        su contorno dibujado sobre RGBA transparente y un GaussianBlur suave.
+
+        Returns:
+            tuple: (layer, dx, dy) — dx/dy es el desplazamiento de la capa
+                   respecto al origen del texto al pegarla sobre el frame
+        """
+        key = (word, getattr(font, 'size', 0), glow_color)
+        cached = self._glow_cache.get(key)
+        if cached is not None:
+            return cached
+
+        try:
+            x0, y0, x1, y1 = font.getbbox(word, stroke_width=_GLOW_STROKE)
+        except TypeError:
+            x0, y0, x1, y1 = font.getbbox(word)
+
+        layer = Image.new('RGBA',
+                          (int(x1 - x0) + _GLOW_PAD * 2, int(y1 - y0) + _GLOW_PAD * 2),
+                          (0, 0, 0, 0))
+        ImageDraw.Draw(layer).text((_GLOW_PAD - x0, _GLOW_PAD - y0), word, font=font,
+                                   fill=glow_color, stroke_width=_GLOW_STROKE,
+                                   stroke_fill=glow_color)
+        layer = layer.filter(ImageFilter.GaussianBlur(1.5))
+        cached = (layer, int(x0) - _GLOW_PAD, int(y0) - _GLOW_PAD)
+        self._glow_cache[key] = cached
+        return cached
+
+    def _render_optimized_two_words(self, frame: Image.Image, display_words: List[str],
                                   highlight_word: str, font, y_position: int) -> Image.Image:
         """
         Renderiza DOS palabras con espaciado óptimo.
@@ -306,7 +490,8 @@ class SimpleVideoCreator:
         
         if len(display_words) != 2:
             # Fallback a palabra única si no hay exactamente 2
-            return self._render_optimized_single_word(frame, display_words[0], highlight_word, font, y_position)
+            text_size = self._measure_text(display_words[0], font, draw)
+            return self._render_optimized_single_word(frame, display_words[0], highlight_word, font, text_size, y_position)
         
         word1, word2 = display_words
         
@@ -340,6 +525,15 @@ class SimpleVideoCreator:
 
     
     def _load_font(self, font_size: int):
+        """
+        Carga fuente memoizada por tamaño (unas pocas KB por entrada).
+        """
+        font = self._font_cache.get(font_size)
+        if font is None:
+            font = self._font_cache[font_size] = self._load_font_uncached(font_size)
+        return font
+
+    def _load_font_uncached(self, font_size: int):
         """
         Carga fuente con fallbacks seguros.
         """
@@ -381,34 +575,19 @@ class SimpleVideoCreator:
             border_color = (0, 0, 0)      # Borde negro
             border_width = 5
         
-        # Dibujar borde/sombra
+        # Borde + texto principal en una sola rasterización con el stroke
+        # nativo de Pillow (antes: (2·borde+1)² re-rasterizaciones en Python)
         try:
-            for dx in range(-border_width, border_width + 1):
-                for dy in range(-border_width, border_width + 1):
-                    if dx != 0 or dy != 0:
-                        border_x = int(x + dx)
-                        border_y = int(y + dy)
-                        if border_x >= 0 and border_y >= 0:
-                            draw.text((border_x, border_y), word, font=font, fill=border_color)
-        except Exception as e:
-            logger.warning(f"Error dibujando borde: {e}")
-        
-        # Dibujar texto principal
-        try:
-            draw.text((int(x), int(y)), word, font=font, fill=text_color)
+            draw.text((int(x), int(y)), word, font=font, fill=text_color,
+                      stroke_width=border_width, stroke_fill=border_color)
         except Exception as e:
             logger.warning(f"Error dibujando texto: {e}")
-        
-        # Efecto de brillo para palabras destacadas
+
+        # Efecto de brillo para palabras destacadas: anillo de 1px
         if is_highlighted:
             try:
-                for dx in range(-1, 2):
-                    for dy in range(-1, 2):
-                        if dx != 0 or dy != 0:
-                            glow_x = int(x + dx)
-                            glow_y = int(y + dy)
-                            if glow_x >= 0 and glow_y >= 0:
-                                draw.text((glow_x, glow_y), word, font=font, fill=(255, 255, 100))
+                draw.text((int(x), int(y)), word, font=font, fill=text_color,
+                          stroke_width=1, stroke_fill=(255, 255, 100))
             except Exception as e:
                 logger.warning(f"Error añadiendo brillo: {e}")
     
@@ -429,125 +608,184 @@ class SimpleVideoCreator:
         else:
             return 'default'
     
-    def generate_video_frames_with_whisper(self, config, audio_path: str, audio_duration: float) -> List[str]:
+    def create_video_with_whisper(self, config, audio_path: str, audio_duration: float,
+                                  output_path: str) -> bool:
         """
-        Genera frames de video usando timestamps precisos de Whisper
+        Crea el video completo pipeando los frames crudos a FFmpeg por stdin.
+
+        Sin JPEGs intermedios en disco: cada frame viaja como rawvideo RGB
+        directamente al encoder H.264, eliminando un encode y un round-trip
+        de disco por frame.
         """
         logger.info(f"🎬 Generando frames con Whisper para video de {audio_duration:.1f}s")
-        
+
         # Intentar usar Whisper para timestamps precisos
+        precise_timeline = None
         if self.whisper_generator and Path(audio_path).exists():
             try:
                 logger.info("🤖 Analizando audio con Whisper...")
                 precise_timeline = self.whisper_generator.generate_precise_timeline(
                     audio_path, config.script
                 )
-                
-                if precise_timeline:
-                    return self._generate_frames_from_timeline(config, precise_timeline, audio_duration)
-                    
             except Exception as e:
                 logger.warning(f"⚠️ Error con Whisper: {e}, usando fallback")
-        
-        # Fallback al sistema anterior
-        logger.info("📝 Usando sistema de timing estimado (fallback)")
-        return self.generate_video_frames(config, audio_duration)
-    
-    def _generate_frames_from_timeline(self, config, timeline: List[Dict], audio_duration: float) -> List[str]:
+
+        if precise_timeline:
+            frame_args = self._iter_timeline_frame_args(config, precise_timeline, audio_duration)
+        else:
+            # Fallback al sistema de timing estimado
+            logger.info("📝 Usando sistema de timing estimado (fallback)")
+            frame_args = self._iter_fallback_frame_args(config, audio_duration)
+
+        total_frames = int(audio_duration * self.fps)
+
+        # Render en paralelo: cada frame es independiente dado su estado
+        # (texto, palabra destacada, número de frame), así que el trabajo
+        # PIL/NumPy se reparte entre cores; map preserva el orden para FFmpeg
+        with ProcessPoolExecutor(max_workers=os.cpu_count(),
+                                 initializer=_init_render_worker,
+                                 initargs=(self.use_cv2_text,)) as pool:
+            frames = pool.map(_render_frame, frame_args, chunksize=16)
+            return self._stream_frames_to_ffmpeg(frames, audio_path, output_path, total_frames)
+
+    def _stream_frames_to_ffmpeg(self, frames, audio_file: str, output_path: str,
+                                 total_frames: int) -> bool:
+        """
+        Escribe los frames como rawvideo RGB en el stdin de FFmpeg.
+        """
+        width, height = self.video_size
+        command = [
+            'ffmpeg', '-y',
+            '-f', 'rawvideo', '-pix_fmt', 'rgb24',
+            '-s', f'{width}x{height}', '-r', str(self.fps), '-i', '-',
+            '-i', str(audio_file),
+            '-c:v', 'libx264', '-c:a', 'aac', '-pix_fmt', 'yuv420p',
+            '-shortest', '-movflags', '+faststart',
+            str(output_path)
+        ]
+        proc = subprocess.Popen(command, stdin=subprocess.PIPE,
+                                stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
+
+        # FFmpeg escribe banner y progreso continuamente en stderr; si nadie
+        # lo drena, su buffer (~64KB) se llena, FFmpeg se bloquea escribiendo
+        # y deja de leer stdin, deadlockeando al escritor de frames. Un hilo
+        # lector lo vacía en paralelo y conserva la cola para diagnóstico
+        stderr_chunks = []
+
+        def _drain_stderr():
+            for line in proc.stderr:
+                stderr_chunks.append(line)
+                if len(stderr_chunks) > 100:
+                    del stderr_chunks[:-50]  # Solo interesan las últimas líneas
+
+        stderr_thread = threading.Thread(target=_drain_stderr, daemon=True)
+        stderr_thread.start()
+
+        # La escritura en la tubería (que bloquea cuando el buffer de FFmpeg
+        # se llena) se delega a un hilo escritor único: el frame N se escribe
+        # mientras se recoge el N+1 del pool de render
+        writer = ThreadPoolExecutor(max_workers=1)
+        pending = None
+        try:
+            for frame_num, frame in enumerate(frames):
+                if not isinstance(frame, bytes):
+                    frame = np.asarray(frame, dtype=np.uint8).tobytes()
+                if pending is not None:
+                    pending.result()  # Mantiene el orden y acota la memoria
+                pending = writer.submit(proc.stdin.write, frame)
+
+                # Log progreso cada 100 frames
+                if frame_num % 100 == 0 and total_frames:
+                    logger.info(f"📸 Progreso frames: {(frame_num / total_frames) * 100:.1f}%")
+            if pending is not None:
+                pending.result()
+        except BrokenPipeError:
+            logger.error("🚫 FFmpeg cerró la tubería antes de tiempo")
+        finally:
+            writer.shutdown(wait=True)
+            if proc.stdin:
+                proc.stdin.close()
+
+        returncode = proc.wait()
+        stderr_thread.join()
+        if returncode != 0:
+            stderr = b''.join(stderr_chunks)
+            logger.error(f"❌ Error de FFmpeg: {stderr.decode(errors='replace')[-500:]}")
+            return False
+
+        logger.info(f"✅ Video creado exitosamente: {output_path}")
+        return True
+
+    def _iter_timeline_frame_args(self, config, timeline: List[Dict], audio_duration: float):
         """
-        Genera frames usando timeline preciso de Whisper
+        Pre-pasada barata: genera (yield) los argumentos de render de cada
+        frame usando el timeline preciso de Whisper (solo lookups, sin PIL)
         """
         logger.info(f"✅ Usando timeline preciso de Whisper con {len(timeline)} palabras")
-        
+
         # Calcular número total de frames
         total_frames = int(audio_duration * self.fps)
-        
+
         # Seleccionar esquema de color
         color_scheme = self.select_color_scheme(config.title + " " + config.script)
-        
-        frame_paths = []
-        frames_dir = Path("output/temp/frames")
-        frames_dir.mkdir(exist_ok=True)
-        
-        # Generar frames con timestamps precisos
+
+        # Lookup vectorizado de la palabra activa: en vez de escanear el
+        # timeline linealmente en cada frame (O(frames·palabras)), se
+        # precalcula el índice activo de todos los frames con searchsorted
+        starts = np.array([w['start'] for w in timeline])
+        ends = np.array([w['end'] for w in timeline])
+        frame_times = np.arange(total_frames) / self.fps
+        active_idx = np.searchsorted(starts, frame_times, side='right') - 1
+        clipped_idx = np.clip(active_idx, 0, len(timeline) - 1)
+        active_valid = (active_idx >= 0) & (frame_times < ends[clipped_idx])
+        centers = (starts + ends) / 2  # Para los frames sin palabra activa
+
+        # Contexto (1 antes, actual, 1 después) precalculado por índice del
+        # timeline: un join por palabra en lugar de uno por frame
+        words = [w['word'] for w in timeline]
+        context_strings = [' '.join(words[max(0, i - 1):i + 2]) for i in range(len(words))]
+
+        # Estado por frame con timestamps precisos
         for frame_num in range(total_frames):
-            # Tiempo actual del frame
-            current_time = frame_num / self.fps
-            
-            # Crear frame base con gradiente
-            base_frame = self.create_gradient_frame(color_scheme, frame_num, total_frames)
-            
-            # Encontrar palabra(s) activas en este momento
-            active_words = []
-            highlight_word = None
-            
-            for word_data in timeline:
-                if word_data['start'] <= current_time < word_data['end']:
-                    highlight_word = word_data['word']
-                    break
-            
-            # Crear contexto de palabras (máximo 3 para estilo CapCut)
-            if highlight_word:
-                # Encontrar índice de palabra actual
-                current_index = -1
-                for i, word_data in enumerate(timeline):
-                    if word_data['word'] == highlight_word and word_data['start'] <= current_time < word_data['end']:
-                        current_index = i
-                        break
-                
-                if current_index >= 0:
-                    # Contexto: 1 antes, actual, 1 después (máximo 3)
-                    start_idx = max(0, current_index - 1)
-                    end_idx = min(len(timeline), current_index + 2)
-                    
-                    context_words = timeline[start_idx:end_idx]
-                    current_text = ' '.join([w['word'] for w in context_words])
-                else:
-                    current_text = highlight_word
+            if active_valid[frame_num]:
+                current_index = int(active_idx[frame_num])
+                highlight_word = words[current_index]
+                current_text = context_strings[current_index]
+
+                # Índice para la alternancia amarillo/blanco
+                word_idx = current_index
             else:
                 # Si no hay palabra activa, mostrar contexto basado en tiempo
-                current_text = self._get_context_by_time(timeline, current_time)
+                current_text = self._get_context_by_time(timeline, frame_num / self.fps, centers)
                 highlight_word = None
-            
-            # Añadir subtítulos estilo CapCut con índice para alternancia
-            word_idx = current_index if 'current_index' in locals() and current_index >= 0 else frame_num
-            final_frame = self.create_subtitle_frame(current_text, base_frame, 
-                                                   highlight_word, [w['word'] for w in timeline], word_idx)
-            
-            # Guardar frame
-            frame_path = frames_dir / f"frame_{frame_num:06d}.jpg"
-            final_frame.save(frame_path, "JPEG", quality=85)
-            frame_paths.append(str(frame_path))
-            
-            # Log progreso cada 100 frames
-            if frame_num % 100 == 0:
-                progress = (frame_num / total_frames) * 100
-                logger.info(f"📸 Progreso frames: {progress:.1f}%")
-        
-        logger.info(f"✅ Generados {len(frame_paths)} frames con timestamps precisos")
-        return frame_paths
+                word_idx = frame_num
+
+            yield (color_scheme, frame_num, total_frames, current_text, highlight_word, word_idx)
     
-    def _get_context_by_time(self, timeline: List[Dict], current_time: float) -> str:
+    def _get_context_by_time(self, timeline: List[Dict], current_time: float,
+                             centers: np.ndarray = None) -> str:
         """
         Obtiene contexto de palabras basado en el tiempo actual
+
+        Las 3 más cercanas se seleccionan con argpartition (O(N)) en lugar
+        de construir y ordenar una lista de distancias (O(N log N)).
         """
-        # Encontrar las palabras más cercanas al tiempo actual
-        closest_words = []
-        
-        for word_data in timeline:
-            word_center = (word_data['start'] + word_data['end']) / 2
-            distance = abs(current_time - word_center)
-            closest_words.append((distance, word_data))
-        
-        # Ordenar por distancia y tomar las 3 más cercanas
-        closest_words.sort(key=lambda x: x[0])
-        context_words = [w[1]['word'] for w in closest_words[:3]]
-        
-        return ' '.join(context_words)
+        if centers is None:
+            centers = np.array([(w['start'] + w['end']) / 2 for w in timeline])
 
-    def generate_video_frames(self, config, audio_duration: float) -> List[str]:
+        distances = np.abs(centers - current_time)
+        if len(timeline) <= 3:
+            closest = np.argsort(distances)
+        else:
+            closest = np.argpartition(distances, 3)[:3]
+            closest = closest[np.argsort(distances[closest])]
+
+        return ' '.join(timeline[i]['word'] for i in closest[:3])
+
+    def _iter_fallback_frame_args(self, config, audio_duration: float):
         """
-        Genera todos los frames del video y los guarda como imágenes (sistema fallback)
+        Pre-pasada barata: genera (yield) los argumentos de render de cada
+        frame con timing estimado (sistema fallback)
         """
         logger.info(f"🎬 Generando frames para video de {audio_duration:.1f}s (sistema fallback)")
         
@@ -590,18 +828,11 @@ class SimpleVideoCreator:
         logger.info(f"📝 Procesando {total_words} palabras en {audio_duration:.1f}s")
         logger.info(f"⏱️ {seconds_per_word:.2f} segundos por palabra (ajustado: {adjusted_wps:.2f} wps)")
         
-        frame_paths = []
-        frames_dir = Path("output/temp/frames")
-        frames_dir.mkdir(exist_ok=True)
-        
-        # Generar frames con sincronización precisa
+        # Estado por frame con sincronización precisa
         for frame_num in range(total_frames):
             # Tiempo actual del frame
             current_time = frame_num / self.fps
-            
-            # Crear frame base con gradiente
-            base_frame = self.create_gradient_frame(color_scheme, frame_num, total_frames)
-            
+
             # Encontrar palabra activa en este momento
             current_word_data = None
             current_word_index = -1
@@ -642,30 +873,36 @@ class SimpleVideoCreator:
                 current_text = ' '.join(script_words[:3])
                 highlight_word = script_words[0] if script_words else None
             
-            # Añadir subtítulos estilo CapCut
-            final_frame = self.create_subtitle_frame(current_text, base_frame, 
-                                                   highlight_word, script_words)
-            
-            # Guardar frame
-            frame_path = frames_dir / f"frame_{frame_num:06d}.jpg"
-            final_frame.save(frame_path, "JPEG", quality=85)
-            frame_paths.append(str(frame_path))
-            
-            # Log progreso cada 100 frames
-            if frame_num % 100 == 0:
-                progress = (frame_num / total_frames) * 100
-                logger.info(f"📸 Progreso frames: {progress:.1f}%")
-        
-        logger.info(f"✅ Generados {len(frame_paths)} frames exitosamente")
-        return frame_paths
-    
-    def frames_to_video_command(self, frame_paths: List[str], audio_file: str, 
-                               output_path: str) -> str:
-        """
-        Genera comando FFmpeg para convertir frames a video
-        """
-        frames_pattern = str(Path(frame_paths[0]).parent / "frame_%06d.jpg")
-        
-        command = f"""ffmpeg -y -framerate {self.fps} -i "{frames_pattern}" -i "{audio_file}" -c:v libx264 -c:a aac -pix_fmt yuv420p -shortest -movflags +faststart "{output_path}" """
-        
-        return command.strip()
\ No newline at end of file
+            yield (color_scheme, frame_num, total_frames, current_text, highlight_word, 0)
+
+
+# Instancia perezosa por proceso worker: se construye una sola vez por
+# proceso (sin cargar Whisper) y se reutiliza entre frames
+_WORKER_CREATOR = None
+_WORKER_USE_CV2_TEXT = False
+
+
+def _init_render_worker(use_cv2_text: bool) -> None:
+    """
+    Inicializador del pool: propaga al worker los flags del creador padre
+    (sin esto, el camino opt-in de texto OpenCV nunca llegaría al render).
+    """
+    global _WORKER_USE_CV2_TEXT
+    _WORKER_USE_CV2_TEXT = use_cv2_text
+
+
+def _render_frame(args) -> bytes:
+    """
+    Renderiza un frame completo (gradiente + subtítulos) en un proceso
+    worker y lo devuelve como bytes RGB listos para el stdin de FFmpeg.
+    """
+    global _WORKER_CREATOR
+    if _WORKER_CREATOR is None:
+        _WORKER_CREATOR = SimpleVideoCreator(load_whisper=False,
+                                             use_cv2_text=_WORKER_USE_CV2_TEXT)
+
+    color_scheme, frame_num, total_frames, current_text, highlight_word, word_idx = args
+    base_frame = _WORKER_CREATOR._base_frame_for(color_scheme, frame_num, total_frames)
+    final_frame = _WORKER_CREATOR.create_subtitle_frame(current_text, base_frame,
+                                                        highlight_word, None, word_idx)
+    return np.asarray(final_frame, dtype=np.uint8).tobytes()
\ No newline at end of file
@@ -4,26 +4,68 @@ Sistema de fondos de video profesionales que se repiten en loop
 """
 
 import os
+import re
+import math
 import logging
+from functools import lru_cache
 from typing import List, Tuple, Optional, Any
 import numpy as np
 
 # MoviePy imports con manejo de errores
 try:
-    from moviepy.editor import VideoFileClip, ColorClip, concatenate_videoclips
+    from moviepy.editor import VideoClip, ColorClip
     MOVIEPY_AVAILABLE = True
 except ImportError:
     MOVIEPY_AVAILABLE = False
     # Clases mock para desarrollo
-    class VideoFileClip:
+    class VideoClip:
         pass
     class ColorClip:
         pass
-    def concatenate_videoclips(clips):
-        pass
+
+# Numba es opcional: compila el kernel del gradiente a código nativo paralelo
+try:
+    from numba import njit, prange
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
 
 logger = logging.getLogger(__name__)
 
+
+if NUMBA_AVAILABLE:
+    @njit(parallel=True, fastmath=True, cache=True)
+    def _gradient_kernel(t, out, step):
+        """Kernel del gradiente ondulante: una pasada sin temporales grandes."""
+        alto, ancho = out.shape[0], out.shape[1]
+        for y in prange(alto):
+            wave2 = np.sin(y * step + t * 1.5) * 0.5 + 0.5
+            for x in range(ancho):
+                wave1 = np.sin(x * step + t * 2) * 0.5 + 0.5
+                combined = (wave1 + wave2) / 2
+                if combined < 0.33:
+                    p = combined * 3
+                    r = 102 + (118 - 102) * p
+                    g = 126 + (75 - 126) * p
+                    b = 234 + (162 - 234) * p
+                elif combined < 0.66:
+                    p = (combined - 0.33) * 3
+                    r = 118 + (240 - 118) * p
+                    g = 75 + (147 - 75) * p
+                    b = 162 + (251 - 162) * p
+                else:
+                    r, g, b = 240.0, 147.0, 251.0
+                out[y, x, 0] = np.uint8(r)
+                out[y, x, 1] = np.uint8(g)
+                out[y, x, 2] = np.uint8(b)
+
+    try:
+        # Calentamiento: amortiza el coste de compilación JIT en el import
+        _gradient_kernel(0.0, np.empty((2, 2, 3), dtype=np.uint8), 0.01)
+    except Exception:
+        NUMBA_AVAILABLE = False
+
+
 class VideoTemplateGenerator:
     """
     Genera plantillas de video de fondo dinámicas para shorts
@@ -32,9 +74,65 @@ class VideoTemplateGenerator:
     def __init__(self, templates_dir: str = "assets/video_templates"):
         self.templates_dir = templates_dir
         self.video_size = (1080, 1920)  # 9:16 para shorts
-        
+
+        # Los fondos se renderizan a media resolución (4x menos píxeles y
+        # ancho de banda) y get_template_for_topic reescala bilinealmente;
+        # el detalle de estas plantillas no lo nota nadie a 1080p
+        self._render_size = (self.video_size[0] // 2, self.video_size[1] // 2)
+        self._render_scale = self.video_size[0] // self._render_size[0]
+
         # Crear directorio si no existe
         os.makedirs(templates_dir, exist_ok=True)
+
+        # Coordenadas 1D precomputadas para los kernels vectorizados
+        # (float32: la mitad de tráfico de memoria en los temporales).
+        # El paso se escala para que las ondas se vean igual tras el upscale
+        self._coord_step = np.float32(0.01 * self._render_scale)
+        self._x_coords = np.arange(self._render_size[0], dtype=np.float32) * self._coord_step
+        self._y_coords = np.arange(self._render_size[1], dtype=np.float32) * self._coord_step
+
+        # Fondo cósmico estático precomputado (#1a1a2e a #16213e/#0f3460):
+        # el gradiente no depende de t, así que se calcula una sola vez
+        progress = np.linspace(0, 1, self._render_size[1])[:, None]
+        bg = np.empty((self._render_size[1], self._render_size[0], 3), dtype=np.uint8)
+        bg[..., 0] = (26 + (22 - 26) * progress).astype(np.uint8)
+        bg[..., 1] = (26 + (33 - 26) * progress).astype(np.uint8)
+        bg[..., 2] = (46 + (62 - 46) * progress).astype(np.uint8)
+        self._cosmic_bg = bg
+
+        # Fondo del fallback (negro a azul oscuro), igualmente estático
+        fallback = np.empty((self._render_size[1], self._render_size[0], 3), dtype=np.uint8)
+        fallback[..., 0] = 10
+        fallback[..., 1] = 15
+        fallback[..., 2] = (50 * progress).astype(np.uint8)
+        self._fallback_bg = fallback
+
+        # Líneas del grid tecnológico y sus fases constantes (80 px y
+        # 2 px de ancho a resolución final)
+        grid_spacing = 80 // self._render_scale
+        stripe_px = max(1, 2 // self._render_scale)
+        grid_x = np.arange(0, self._render_size[0], grid_spacing)
+        grid_y = np.arange(0, self._render_size[1], grid_spacing)
+        self._grid_x_cols = (grid_x[:, None] + np.arange(stripe_px)).ravel()
+        self._grid_y_rows = (grid_y[:, None] + np.arange(stripe_px)).ravel()
+        self._grid_stripe_px = stripe_px
+        self._gx_phase = grid_x * 0.01 * self._render_scale
+        self._gy_phase = grid_y * 0.01 * self._render_scale
+
+        # Patrones tema -> plantilla precompilados: una sola búsqueda
+        # de regex por selección en lugar de cuatro generadores any()
+        self._topic_patterns = [
+            ('cosmic_particles', re.compile(r'espacio|universo|planeta|estrella|cósmico', re.I)),
+            ('tech_grid', re.compile(r'tecnología|tech|digital|futuro', re.I)),
+            ('nature_flow', re.compile(r'océano|agua|mar|naturaleza', re.I)),
+            ('energy_burst', re.compile(r'energía|poder|fuerza|explosión', re.I)),
+        ]
+
+        # Buffer de frame reutilizable (~1.5 MB): evita un alloc por frame.
+        # Los frames crudos comparten este buffer; el caché de
+        # _memoize_make_frame guarda copias, así que no hay aliasing.
+        self._frame_buf = np.empty(
+            (self._render_size[1], self._render_size[0], 3), dtype=np.uint8)
         
         # Plantillas disponibles (se crearán programáticamente)
         self.template_configs = {
@@ -70,7 +168,25 @@ class VideoTemplateGenerator:
             }
         }
     
-    def create_particle_template(self, duration: float, colors: List[str]) -> VideoFileClip:
+    @staticmethod
+    def _memoize_make_frame(make_frame, fps: int, maxsize: int = 64):
+        """
+        Cachea frames por índice de frame cuantizado (round(t * fps)).
+
+        Los make_frame son funciones puras de t y, con el loop modular,
+        cada t % base_duration se repite en todas las vueltas: el caché
+        genera cada frame distinto una sola vez. maxsize acota la RAM
+        (~1.5 MB por frame a media resolución).
+        """
+        @lru_cache(maxsize=maxsize)
+        def _frame_at(k):
+            # Copia en el fallo de caché: el frame crudo puede compartir
+            # el buffer reutilizable de la instancia
+            return make_frame(k / fps).copy()
+
+        return lambda t: _frame_at(int(round(t * fps)))
+
+    def create_particle_template(self, duration: float, colors: List[str]) -> VideoClip:
         """
         Crea plantilla con partículas flotantes
         """
@@ -79,38 +195,33 @@ class VideoTemplateGenerator:
         try:
             # Crear clip base con gradiente
             def make_frame(t):
-                # Gradiente vertical
-                frame = np.zeros((self.video_size[1], self.video_size[0], 3), dtype=np.uint8)
-                
-                # Color base gradiente
-                for y in range(self.video_size[1]):
-                    progress = y / self.video_size[1]
-                    # Interpolación entre colores
-                    r = int(26 + (22 - 26) * progress)  # #1a1a2e a #16213e
-                    g = int(26 + (33 - 26) * progress)
-                    b = int(46 + (62 - 46) * progress)
-                    frame[y, :] = [r, g, b]
-                
-                # Añadir partículas animadas
-                num_particles = 50
-                for i in range(num_particles):
-                    # Posición de partícula basada en tiempo
-                    x = int((np.sin(t * 0.5 + i * 0.1) * 0.3 + 0.5) * self.video_size[0])
-                    y = int(((t * 20 + i * 50) % (self.video_size[1] + 100)) - 50)
-                    
-                    if 0 <= x < self.video_size[0] and 0 <= y < self.video_size[1]:
-                        # Brillo de partícula
-                        brightness = int(100 + 50 * np.sin(t * 2 + i))
-                        frame[y:y+3, x:x+3] = [brightness, brightness, brightness + 50]
-                
+                # Gradiente vertical precomputado (invariante en el tiempo)
+                frame = self._frame_buf
+                np.copyto(frame, self._cosmic_bg)
+
+                # Geometría de las 50 partículas calculada en bloque
+                # (en coordenadas de resolución final, divididas al buffer)
+                i = np.arange(50)
+                escala = self._render_scale
+                xs = (((np.sin(t * 0.5 + i * 0.1) * 0.3 + 0.5) * self.video_size[0])
+                      // escala).astype(np.int32)
+                ys = ((((t * 20 + i * 50) % (self.video_size[1] + 100)) - 50)
+                      // escala).astype(np.int32)
+                brightness = (100 + 50 * np.sin(t * 2 + i)).astype(np.int32)
+
+                visible = (xs >= 0) & (xs < self._render_size[0]) & \
+                          (ys >= 0) & (ys < self._render_size[1])
+                for x, y, b in zip(xs[visible], ys[visible], brightness[visible]):
+                    frame[y:y+2, x:x+2] = [b, b, b + 50]
+
                 return frame
             
             # Crear clip de video
-            clip = VideoFileClip.__new__(VideoFileClip)
-            clip.make_frame = make_frame
-            clip.duration = duration
+            clip = VideoClip(
+                make_frame=self._memoize_make_frame(make_frame, fps=30),
+                duration=duration)
             clip.fps = 30
-            clip.size = self.video_size
+            clip.size = self._render_size
             
             return clip
             
@@ -118,7 +229,7 @@ class VideoTemplateGenerator:
             logger.error(f"❌ Error creando plantilla de partículas: {e}")
             return self.create_fallback_template(duration)
     
-    def create_gradient_template(self, duration: float, colors: List[str]) -> VideoFileClip:
+    def create_gradient_template(self, duration: float, colors: List[str]) -> VideoClip:
         """
         Crea plantilla con gradientes animados
         """
@@ -126,41 +237,37 @@ class VideoTemplateGenerator:
         
         try:
             def make_frame(t):
-                frame = np.zeros((self.video_size[1], self.video_size[0], 3), dtype=np.uint8)
-                
-                # Gradiente ondulante
-                for y in range(self.video_size[1]):
-                    for x in range(self.video_size[0]):
-                        # Crear ondas
-                        wave1 = np.sin(x * 0.01 + t * 2) * 0.5 + 0.5
-                        wave2 = np.sin(y * 0.01 + t * 1.5) * 0.5 + 0.5
-                        combined = (wave1 + wave2) / 2
-                        
-                        # Interpolación de colores
-                        if combined < 0.33:
-                            # Azul a púrpura
-                            r = int(102 + (118 - 102) * (combined * 3))
-                            g = int(126 + (75 - 126) * (combined * 3))
-                            b = int(234 + (162 - 234) * (combined * 3))
-                        elif combined < 0.66:
-                            # Púrpura a rosa
-                            progress = (combined - 0.33) * 3
-                            r = int(118 + (240 - 118) * progress)
-                            g = int(75 + (147 - 75) * progress)
-                            b = int(162 + (251 - 162) * progress)
-                        else:
-                            # Rosa brillante
-                            r, g, b = 240, 147, 251
-                        
-                        frame[y, x] = [r, g, b]
-                
+                if NUMBA_AVAILABLE:
+                    frame = self._frame_buf
+                    _gradient_kernel(t, frame, float(self._coord_step))
+                    return frame
+
+                # Ondas 1D vectorizadas (float32) combinadas por broadcasting
+                wave1 = np.sin(self._x_coords + np.float32(t * 2)) * np.float32(0.5) + np.float32(0.5)
+                wave2 = np.sin(self._y_coords + np.float32(t * 1.5)) * np.float32(0.5) + np.float32(0.5)
+                combined = (wave1[None, :] + wave2[:, None]) * np.float32(0.5)  # (H, W)
+
+                # Interpolación de colores por tramos: azul -> púrpura -> rosa
+                c_azul = np.array([102, 126, 234], dtype=np.float32)
+                c_purpura = np.array([118, 75, 162], dtype=np.float32)
+                c_rosa = np.array([240, 147, 251], dtype=np.float32)
+
+                p = combined[..., None]  # (H, W, 1) para broadcasting RGB
+                tramo_bajo = c_azul + (c_purpura - c_azul) * (p * 3)
+                tramo_medio = c_purpura + (c_rosa - c_purpura) * ((p - np.float32(0.33)) * 3)
+
+                frame = np.where(
+                    p < 0.33, tramo_bajo,
+                    np.where(p < 0.66, tramo_medio, c_rosa)
+                ).astype(np.uint8, copy=False)
+
                 return frame
             
-            clip = VideoFileClip.__new__(VideoFileClip)
-            clip.make_frame = make_frame
-            clip.duration = duration
+            clip = VideoClip(
+                make_frame=self._memoize_make_frame(make_frame, fps=24),
+                duration=duration)
             clip.fps = 24
-            clip.size = self.video_size
+            clip.size = self._render_size
             
             return clip
             
@@ -168,7 +275,7 @@ class VideoTemplateGenerator:
             logger.error(f"❌ Error creando plantilla de gradientes: {e}")
             return self.create_fallback_template(duration)
     
-    def create_tech_template(self, duration: float, colors: List[str]) -> VideoFileClip:
+    def create_tech_template(self, duration: float, colors: List[str]) -> VideoClip:
         """
         Crea plantilla tecnológica con grid
         """
@@ -176,39 +283,41 @@ class VideoTemplateGenerator:
         
         try:
             def make_frame(t):
-                frame = np.zeros((self.video_size[1], self.video_size[0], 3), dtype=np.uint8)
-                
-                # Fondo oscuro
+                # Fondo oscuro sobre el buffer reutilizable
+                frame = self._frame_buf
                 frame.fill(10)
                 
-                # Grid vertical
-                grid_spacing = 80
-                for x in range(0, self.video_size[0], grid_spacing):
-                    alpha = 0.3 + 0.2 * np.sin(t * 2 + x * 0.01)
-                    color_val = int(255 * alpha * 0.3)
-                    if x < self.video_size[0]:
-                        frame[:, x:x+2] = [0, color_val, int(color_val * 1.5)]
-                
+                # Grid vertical: brillo de todas las líneas en un solo np.sin
+                col_val = np.repeat(
+                    (255 * (0.3 + 0.2 * np.sin(t * 2 + self._gx_phase)) * 0.3).astype(np.uint8),
+                    self._grid_stripe_px)
+                frame[:, self._grid_x_cols, 0] = 0
+                frame[:, self._grid_x_cols, 1] = col_val
+                frame[:, self._grid_x_cols, 2] = (col_val * 1.5).astype(np.uint8)
+
                 # Grid horizontal
-                for y in range(0, self.video_size[1], grid_spacing):
-                    alpha = 0.3 + 0.2 * np.sin(t * 1.5 + y * 0.01)
-                    color_val = int(255 * alpha * 0.3)
-                    if y < self.video_size[1]:
-                        frame[y:y+2, :] = [0, color_val, int(color_val * 1.5)]
-                
-                # Pulsos de energía
+                row_val = np.repeat(
+                    (255 * (0.3 + 0.2 * np.sin(t * 1.5 + self._gy_phase)) * 0.3).astype(np.uint8),
+                    self._grid_stripe_px)
+                frame[self._grid_y_rows, :, 0] = 0
+                frame[self._grid_y_rows, :, 1] = row_val[:, None]
+                frame[self._grid_y_rows, :, 2] = (row_val * 1.5).astype(np.uint8)[:, None]
+
+                # Pulsos de energía (en coordenadas de resolución final)
                 pulse_y = int((t * 100) % self.video_size[1])
                 if pulse_y < self.video_size[1] - 20:
-                    brightness = int(200 * np.exp(-((pulse_y % 200) / 50) ** 2))
-                    frame[pulse_y:pulse_y+20, :] = [0, brightness, brightness]
+                    brightness = int(200 * math.exp(-((pulse_y % 200) / 50) ** 2))
+                    fila = pulse_y // self._render_scale
+                    banda = 20 // self._render_scale
+                    frame[fila:fila + banda, :] = [0, brightness, brightness]
                 
                 return frame
             
-            clip = VideoFileClip.__new__(VideoFileClip)
-            clip.make_frame = make_frame
-            clip.duration = duration
+            clip = VideoClip(
+                make_frame=self._memoize_make_frame(make_frame, fps=30),
+                duration=duration)
             clip.fps = 30
-            clip.size = self.video_size
+            clip.size = self._render_size
             
             return clip
             
@@ -216,29 +325,24 @@ class VideoTemplateGenerator:
             logger.error(f"❌ Error creando plantilla tech: {e}")
             return self.create_fallback_template(duration)
     
-    def create_fallback_template(self, duration: float) -> VideoFileClip:
+    def create_fallback_template(self, duration: float) -> VideoClip:
         """
         Crea plantilla de respaldo simple
         """
         logger.info("🎨 Creando plantilla de respaldo")
         
         try:
-            # Gradiente simple negro a azul oscuro
+            # Gradiente simple negro a azul oscuro, precomputado en __init__
             def make_frame(t):
-                frame = np.zeros((self.video_size[1], self.video_size[0], 3), dtype=np.uint8)
-                
-                for y in range(self.video_size[1]):
-                    progress = y / self.video_size[1]
-                    blue_val = int(50 * progress)
-                    frame[y, :] = [10, 15, blue_val]
-                
+                frame = self._frame_buf
+                np.copyto(frame, self._fallback_bg)
                 return frame
             
-            clip = VideoFileClip.__new__(VideoFileClip)
-            clip.make_frame = make_frame
-            clip.duration = duration
+            clip = VideoClip(
+                make_frame=self._memoize_make_frame(make_frame, fps=24),
+                duration=duration)
             clip.fps = 24
-            clip.size = self.video_size
+            clip.size = self._render_size
             
             return clip
             
@@ -247,23 +351,16 @@ class VideoTemplateGenerator:
             # Como último recurso, usar ColorClip
             return ColorClip(size=self.video_size, color=[20, 30, 60]).set_duration(duration)
     
-    def get_template_for_topic(self, topic: str, duration: float) -> VideoFileClip:
+    def get_template_for_topic(self, topic: str, duration: float) -> VideoClip:
         """
         Selecciona plantilla apropiada según el tema
         """
-        topic_lower = topic.lower()
-        
-        # Mapear temas a plantillas
-        if any(word in topic_lower for word in ['espacio', 'universo', 'planeta', 'estrella', 'cósmico']):
-            template_key = 'cosmic_particles'
-        elif any(word in topic_lower for word in ['tecnología', 'tech', 'digital', 'futuro']):
-            template_key = 'tech_grid'
-        elif any(word in topic_lower for word in ['océano', 'agua', 'mar', 'naturaleza']):
-            template_key = 'nature_flow'
-        elif any(word in topic_lower for word in ['energía', 'poder', 'fuerza', 'explosión']):
-            template_key = 'energy_burst'
-        else:
-            template_key = 'gradient_waves'  # Por defecto
+        # Mapear temas a plantillas con los patrones precompilados
+        template_key = 'gradient_waves'  # Por defecto
+        for key, pattern in self._topic_patterns:
+            if pattern.search(topic):
+                template_key = key
+                break
         
         config = self.template_configs[template_key]
         
@@ -271,15 +368,20 @@ class VideoTemplateGenerator:
         
         # Crear plantilla según tipo
         if config['type'] == 'particles':
-            return self.create_particle_template(duration, config['colors'])
+            clip = self.create_particle_template(duration, config['colors'])
         elif config['type'] == 'tech':
-            return self.create_tech_template(duration, config['colors'])
-        elif config['type'] == 'waves':
-            return self.create_gradient_template(duration, config['colors'])
+            clip = self.create_tech_template(duration, config['colors'])
         else:
-            return self.create_gradient_template(duration, config['colors'])
+            clip = self.create_gradient_template(duration, config['colors'])
+
+        # Reescalar (bilineal) de media resolución a la resolución final
+        try:
+            return clip.resize(self.video_size)
+        except Exception as e:
+            logger.error(f"❌ Error reescalando plantilla: {e}")
+            return clip
     
-    def create_looped_background(self, topic: str, target_duration: float) -> VideoFileClip:
+    def create_looped_background(self, topic: str, target_duration: float) -> VideoClip:
         """
         Crea fondo de video en loop para la duración completa
         """
@@ -292,20 +394,15 @@ class VideoTemplateGenerator:
         if target_duration <= base_duration:
             return base_clip.set_duration(target_duration)
         
-        # Hacer loop para cubrir duración completa
-        loops_needed = int(np.ceil(target_duration / base_duration))
-        
         try:
-            # Crear clips repetidos
-            clips = [base_clip.copy() for _ in range(loops_needed)]
-            looped_clip = concatenate_videoclips(clips)
-            
-            # Ajustar a duración exacta
+            # Remapear el tiempo en módulo: un solo clip cubre toda la
+            # duración sin copiar ni concatenar repeticiones
+            looped_clip = base_clip.fl_time(lambda t: t % base_duration)
             final_clip = looped_clip.set_duration(target_duration)
-            
-            logger.info(f"✅ Fondo en loop creado: {loops_needed} repeticiones")
+
+            logger.info(f"✅ Fondo en loop creado ({target_duration / base_duration:.1f} vueltas)")
             return final_clip
-            
+
         except Exception as e:
             logger.error(f"❌ Error creando loop: {e}")
             return base_clip.set_duration(target_duration)
\ No newline at end of file
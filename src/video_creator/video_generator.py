@@ -6,12 +6,15 @@ Versión simplificada que funciona sin dependencias pesadas.
 import logging
 import os
 import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from pathlib import Path
 from typing import List, Dict, Optional, Tuple
 from dataclasses import dataclass
 import requests
 from io import BytesIO
 import edge_tts
+import numpy as np
 
 # Imagen processing básico
 try:
@@ -23,6 +26,14 @@ except ImportError:
 
 logger = logging.getLogger(__name__)
 
+@lru_cache(maxsize=16)
+def _get_font(size: int):
+    """Carga la fuente al tamaño pedido una sola vez (parsear el TTF es caro)."""
+    try:
+        return ImageFont.truetype("arial.ttf", size)
+    except Exception:
+        return ImageFont.load_default()
+
 def clean_filename(filename: str, max_length: int = 50) -> str:
     """Limpia un string para ser usado como nombre de archivo válido."""
     import re
@@ -122,38 +133,22 @@ class VideoCreator:
             
             logger.info(f"� Duración del audio: {audio_duration:.1f}s")
             
-            # 2. Generar frames con subtítulos dinámicos usando Whisper
-            frame_paths = self.simple_video_creator.generate_video_frames_with_whisper(
-                config, str(audio_file), audio_duration
-            )
-            
-            logger.info(f"� Generados {len(frame_paths)} frames")
-            
-            # 3. Crear video final con FFmpeg
+            # 2. Generar frames y pipearlos directamente a FFmpeg (rawvideo
+            # por stdin: sin JPEGs intermedios ni limpieza de temporales)
             clean_title = clean_filename(config.title, 40)
             output_path = self.output_dir / f"short_{clean_title}.mp4"
-            
-            # Comando FFmpeg
-            ffmpeg_command = self.simple_video_creator.frames_to_video_command(
-                frame_paths, str(audio_file), str(output_path)
-            )
-            
+
             logger.info("🎬 Creando video final con FFmpeg...")
-            
-            # Ejecutar FFmpeg
-            result = subprocess.run(ffmpeg_command, shell=True, capture_output=True, text=True)
-            
-            if result.returncode == 0:
-                # Limpiar frames temporales
-                import shutil
-                frames_dir = Path(frame_paths[0]).parent
-                shutil.rmtree(frames_dir, ignore_errors=True)
-                
+
+            success = self.simple_video_creator.create_video_with_whisper(
+                config, str(audio_file), audio_duration, str(output_path)
+            )
+
+            if success:
                 logger.info(f"✅ Video avanzado creado exitosamente: {output_path}")
                 return str(output_path)
             else:
-                logger.error(f"❌ Error de FFmpeg: {result.stderr}")
-                raise Exception(f"FFmpeg falló: {result.stderr}")
+                raise Exception("FFmpeg falló generando el video")
                 
         except Exception as e:
             logger.error(f"❌ Error creando video avanzado: {e}")
@@ -330,121 +325,125 @@ class VideoCreator:
             logger.warning("PIL no disponible. No se pueden crear placeholders.")
             return []
         
-        placeholder_images = []
-        
         # Obtener configuración dinámica basada en tema y tópico
         theme_config = self._get_dynamic_theme_config(topic, theme)
-        
-        for i in range(count):
-            try:
-                # Crear imagen base 9:16 para Shorts
-                img = Image.new('RGB', (1080, 1920))
-                
-                # CREAR GRADIENTE DINÁMICO BASADO EN TEMÁTICA
-                img = self._create_dynamic_background(theme_config, i)
-                
-                draw = ImageDraw.Draw(img)
-                
-                # AÑADIR EFECTOS DINÁMICOS SEGÚN TEMÁTICA
-                img = self._add_dynamic_effects(img, theme_config, i)
-                
-                # TEXTO PRINCIPAL CLICKBAIT DINÁMICO
-                title = self._generate_dynamic_title(topic, theme, i, theme_config)
-                
-                # Fuente para título principal
-                try:
-                    title_font = ImageFont.truetype("arial.ttf", 85)  # Más pequeño
-                    subtitle_font = ImageFont.truetype("arial.ttf", 45)
-                except:
-                    title_font = ImageFont.load_default()
-                    subtitle_font = ImageFont.load_default()
-                
-                # DISEÑO PROFESIONAL CON CAPAS
-                
-                # 1. Fondo semi-transparente para texto
-                text_bg_height = 400
-                text_bg_y = (1920 - text_bg_height) // 2
-                
-                # Rectángulo con gradiente oscuro
-                for y in range(text_bg_y, text_bg_y + text_bg_height):
-                    alpha = int(180 * (1 - abs(y - (text_bg_y + text_bg_height/2)) / (text_bg_height/2)))
-                    for x in range(100, 980):  # Márgenes laterales
-                        current_pixel = img.getpixel((x, y))
-                        new_pixel = (
-                            max(0, current_pixel[0] - alpha//3),
-                            max(0, current_pixel[1] - alpha//3),
-                            max(0, current_pixel[2] - alpha//4)
-                        )
-                        img.putpixel((x, y), new_pixel)
-                
-                # 2. Texto con sombra y outline
-                lines = title.split('\n')
-                line_height = 90
-                total_height = len(lines) * line_height
-                start_y = (1920 - total_height) // 2
-                
-                for j, line in enumerate(lines):
-                    y_pos = start_y + j * line_height
-                    
-                    # Obtener tamaño del texto
-                    bbox = draw.textbbox((0, 0), line, font=title_font)
-                    text_width = bbox[2] - bbox[0]
-                    x_pos = (1080 - text_width) // 2
-                    
-                    # Outline negro grueso (múltiples capas)
-                    for offset_x in [-3, -2, -1, 0, 1, 2, 3]:
-                        for offset_y in [-3, -2, -1, 0, 1, 2, 3]:
-                            if offset_x != 0 or offset_y != 0:
-                                draw.text(
-                                    (x_pos + offset_x, y_pos + offset_y), 
-                                    line, 
-                                    fill=(0, 0, 0), 
-                                    font=title_font
-                                )
-                    
-                    # Texto principal blanco
-                    draw.text((x_pos, y_pos), line, fill=(255, 255, 255), font=title_font)
+
+        # Cada imagen es independiente: renderizar en paralelo con hilos
+        # (NumPy y el encode JPEG de Pillow sueltan el GIL)
+        max_workers = min(count, os.cpu_count() or 1)
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            rendered = executor.map(
+                lambda i: self._render_placeholder_image(i, topic, theme, theme_config),
+                range(count))
+
+        return [path for path in rendered if path is not None]
+
+    def _render_placeholder_image(self, i: int, topic: str, theme: str,
+                                  theme_config: Dict) -> Optional[str]:
+        """Renderiza y guarda una imagen placeholder (seguro en un hilo)."""
+
+        try:
+            # CREAR GRADIENTE DINÁMICO BASADO EN TEMÁTICA (9:16 para Shorts)
+            img = self._create_dynamic_background(theme_config, i)
+
+            # AÑADIR EFECTOS DINÁMICOS SEGÚN TEMÁTICA
+            img = self._add_dynamic_effects(img, theme_config, i)
+            
+            # TEXTO PRINCIPAL CLICKBAIT DINÁMICO
+            title = self._generate_dynamic_title(topic, theme, i, theme_config)
+            
+            # Fuente para título principal (cacheada a nivel de módulo)
+            title_font = _get_font(85)  # Más pequeño
+            subtitle_font = _get_font(45)
+            
+            # DISEÑO PROFESIONAL CON CAPAS
+            
+            # 1. Fondo semi-transparente para texto
+            text_bg_height = 400
+            text_bg_y = (1920 - text_bg_height) // 2
+            
+            # Rectángulo con gradiente oscuro, calculado sobre la franja
+            # completa en lugar de píxel a píxel
+            arr = np.asarray(img).astype(np.int16)
+            ys = np.arange(text_bg_y, text_bg_y + text_bg_height)
+            alpha = (180 * (1 - np.abs(ys - (text_bg_y + text_bg_height / 2))
+                            / (text_bg_height / 2))).astype(np.int16)[:, None]
+            franja = arr[text_bg_y:text_bg_y + text_bg_height, 100:980]
+            franja[..., 0] -= alpha // 3
+            franja[..., 1] -= alpha // 3
+            franja[..., 2] -= alpha // 4
+            np.clip(franja, 0, 255, out=franja)
+            img = Image.fromarray(arr.astype(np.uint8), 'RGB')
+            draw = ImageDraw.Draw(img)
+
+
+            # 2. Texto con sombra y outline
+            lines = title.split('\n')
+            line_height = 90
+            total_height = len(lines) * line_height
+            start_y = (1920 - total_height) // 2
+            
+            for j, line in enumerate(lines):
+                y_pos = start_y + j * line_height
                 
-                # 3. Subtítulo inferior
-                subtitle = f"TOP {i+1} IMPACTANTE"
-                bbox = draw.textbbox((0, 0), subtitle, font=subtitle_font)
-                subtitle_width = bbox[2] - bbox[0]
-                subtitle_x = (1080 - subtitle_width) // 2
-                subtitle_y = start_y + total_height + 50
+                # Obtener tamaño del texto
+                bbox = draw.textbbox((0, 0), line, font=title_font)
+                text_width = bbox[2] - bbox[0]
+                x_pos = (1080 - text_width) // 2
                 
-                # Outline para subtítulo
-                for offset_x in [-2, -1, 0, 1, 2]:
-                    for offset_y in [-2, -1, 0, 1, 2]:
+                # Outline negro grueso (múltiples capas)
+                for offset_x in [-3, -2, -1, 0, 1, 2, 3]:
+                    for offset_y in [-3, -2, -1, 0, 1, 2, 3]:
                         if offset_x != 0 or offset_y != 0:
                             draw.text(
-                                (subtitle_x + offset_x, subtitle_y + offset_y), 
-                                subtitle, 
+                                (x_pos + offset_x, y_pos + offset_y), 
+                                line, 
                                 fill=(0, 0, 0), 
-                                font=subtitle_font
+                                font=title_font
                             )
                 
-                draw.text((subtitle_x, subtitle_y), subtitle, fill=(255, 255, 0), font=subtitle_font)
-                
-                # 4. Elemento decorativo (líneas de énfasis)
-                line_y1 = start_y - 30
-                line_y2 = subtitle_y + 80
-                
-                for thickness in range(5):
-                    draw.line([(200, line_y1 + thickness), (880, line_y1 + thickness)], fill=(255, 255, 255))
-                    draw.line([(200, line_y2 + thickness), (880, line_y2 + thickness)], fill=(255, 255, 255))
-                
-                # Guardar imagen
-                safe_theme = "".join(c for c in theme if c.isalnum())[:10] or "generic"
-                img_path = self.temp_dir / f"{safe_theme}_image_{i+1}.jpg"
-                img.save(img_path, quality=90, optimize=True)
-                placeholder_images.append(str(img_path))
-                
-                logger.info(f"✓ Imagen temática profesional creada: {img_path.name}")
-                
-            except Exception as e:
-                logger.error(f"Error creando imagen temática {i}: {e}")
-        
-        return placeholder_images
+                # Texto principal blanco
+                draw.text((x_pos, y_pos), line, fill=(255, 255, 255), font=title_font)
+            
+            # 3. Subtítulo inferior
+            subtitle = f"TOP {i+1} IMPACTANTE"
+            bbox = draw.textbbox((0, 0), subtitle, font=subtitle_font)
+            subtitle_width = bbox[2] - bbox[0]
+            subtitle_x = (1080 - subtitle_width) // 2
+            subtitle_y = start_y + total_height + 50
+            
+            # Outline para subtítulo
+            for offset_x in [-2, -1, 0, 1, 2]:
+                for offset_y in [-2, -1, 0, 1, 2]:
+                    if offset_x != 0 or offset_y != 0:
+                        draw.text(
+                            (subtitle_x + offset_x, subtitle_y + offset_y), 
+                            subtitle, 
+                            fill=(0, 0, 0), 
+                            font=subtitle_font
+                        )
+            
+            draw.text((subtitle_x, subtitle_y), subtitle, fill=(255, 255, 0), font=subtitle_font)
+            
+            # 4. Elemento decorativo (líneas de énfasis)
+            line_y1 = start_y - 30
+            line_y2 = subtitle_y + 80
+            
+            for thickness in range(5):
+                draw.line([(200, line_y1 + thickness), (880, line_y1 + thickness)], fill=(255, 255, 255))
+                draw.line([(200, line_y2 + thickness), (880, line_y2 + thickness)], fill=(255, 255, 255))
+            
+            # Guardar imagen
+            safe_theme = "".join(c for c in theme if c.isalnum())[:10] or "generic"
+            img_path = self.temp_dir / f"{safe_theme}_image_{i+1}.jpg"
+            img.save(img_path, quality=90, optimize=True)
+
+            logger.info(f"✓ Imagen temática profesional creada: {img_path.name}")
+            return str(img_path)
+
+        except Exception as e:
+            logger.error(f"Error creando imagen temática {i}: {e}")
+            return None
     
     def _get_dynamic_theme_config(self, topic: str, theme: str) -> Dict:
         """Genera configuración dinámica basada en tema y tópico."""
@@ -535,10 +534,9 @@ class VideoCreator:
     def _create_dynamic_background(self, theme_config: Dict, index: int) -> Image.Image:
         """Crea fondo fotorrealista dinámico basado en la configuración temática."""
         
-        img = Image.new('RGB', (1080, 1920))
         colors = theme_config['colors']
         effect_type = theme_config['effect_type']
-        
+
         # Crear fondo fotorrealista según la temática
         if effect_type == 'bubbles':  # Océano
             img = self._create_ocean_background(colors, index)
@@ -563,43 +561,43 @@ class VideoCreator:
         """Añade efectos dinámicos según la temática."""
         
         import random
-        random.seed(42 + index)
+        rng = random.Random(42 + index)  # RNG local: seguro entre hilos
         draw = ImageDraw.Draw(img)
         effect_type = theme_config['effect_type']
         accent_color = theme_config['accent_color']
         
         if effect_type == 'bubbles':  # Océano
             for _ in range(40):
-                x = random.randint(0, 1080)
-                y = random.randint(300, 1920)
-                size = random.randint(5, 20)
+                x = rng.randint(0, 1080)
+                y = rng.randint(300, 1920)
+                size = rng.randint(5, 20)
                 draw.ellipse([x-size, y-size, x+size, y+size], fill=(*accent_color, 60))
                 
         elif effect_type == 'stars':  # Espacio
             for _ in range(60):
-                x = random.randint(0, 1080)
-                y = random.randint(0, 1920)
-                size = random.randint(2, 8)
+                x = rng.randint(0, 1080)
+                y = rng.randint(0, 1920)
+                size = rng.randint(2, 8)
                 draw.ellipse([x-size, y-size, x+size, y+size], fill=accent_color)
                 
         elif effect_type == 'circuits':  # Tecnología
             for _ in range(30):
-                x1, y1 = random.randint(0, 1080), random.randint(0, 1920)
-                x2, y2 = x1 + random.randint(-100, 100), y1 + random.randint(-100, 100)
+                x1, y1 = rng.randint(0, 1080), rng.randint(0, 1920)
+                x2, y2 = x1 + rng.randint(-100, 100), y1 + rng.randint(-100, 100)
                 draw.line([(x1, y1), (x2, y2)], fill=accent_color, width=2)
                 
         elif effect_type == 'energy':  # Deportes
             for _ in range(20):
-                x = random.randint(0, 1080)
-                y = random.randint(0, 1920)
-                w, h = random.randint(10, 50), random.randint(5, 15)
+                x = rng.randint(0, 1080)
+                y = rng.randint(0, 1920)
+                w, h = rng.randint(10, 50), rng.randint(5, 15)
                 draw.ellipse([x, y, x+w, y+h], fill=accent_color)
                 
         else:  # Efectos genéricos
             for _ in range(25):
-                x = random.randint(0, 1080)
-                y = random.randint(0, 1920)
-                size = random.randint(3, 15)
+                x = rng.randint(0, 1080)
+                y = rng.randint(0, 1920)
+                size = rng.randint(3, 15)
                 draw.rectangle([x, y, x+size, y+size], fill=accent_color)
         
         return img
@@ -607,263 +605,238 @@ class VideoCreator:
     def _create_ocean_background(self, colors: List[tuple], index: int) -> Image.Image:
         """Crea fondo oceánico fotorrealista con ondas y profundidad."""
         
-        img = Image.new('RGB', (1080, 1920))
-        import math
-        
-        # Simular capas oceánicas realistas
-        for y in range(1920):
-            for x in range(1080):
-                # Profundidad oceánica (más oscuro hacia abajo)
-                depth = y / 1920
-                
-                # Ondas sinusoidales realistas
-                wave1 = math.sin(x * 0.01 + y * 0.003) * 30
-                wave2 = math.sin(x * 0.007 + y * 0.005) * 20
-                wave3 = math.sin(x * 0.013 + y * 0.002) * 15
-                
-                # Rayos de luz que penetran
-                light_ray = max(0, 100 - depth * 150 + wave1 + wave2)
-                
-                # Color base oceánico
-                base_blue = int(colors[0][2] + depth * (colors[2][2] - colors[0][2]))
-                base_green = int(colors[0][1] + depth * (colors[2][1] - colors[0][1]) + light_ray * 0.3)
-                base_red = int(colors[0][0] + depth * (colors[2][0] - colors[0][0]) + light_ray * 0.1)
-                
-                # Efectos de ondas
-                final_r = max(0, min(255, int(base_red + wave3)))
-                final_g = max(0, min(255, int(base_green + wave1 * 0.5)))
-                final_b = max(0, min(255, int(base_blue + wave2 * 0.3)))
-                
-                img.putpixel((x, y), (final_r, final_g, final_b))
-        
-        return img
+        x = np.arange(1080, dtype=np.float32)[None, :]
+        y = np.arange(1920, dtype=np.float32)[:, None]
+
+        # Profundidad oceánica (más oscuro hacia abajo)
+        depth = y / 1920
+
+        # Ondas sinusoidales realistas
+        wave1 = np.sin(x * 0.01 + y * 0.003) * 30
+        wave2 = np.sin(x * 0.007 + y * 0.005) * 20
+        wave3 = np.sin(x * 0.013 + y * 0.002) * 15
+
+        # Rayos de luz que penetran
+        light_ray = np.maximum(0, 100 - depth * 150 + wave1 + wave2)
+
+        # Color base oceánico
+        base_blue = colors[0][2] + depth * (colors[2][2] - colors[0][2])
+        base_green = colors[0][1] + depth * (colors[2][1] - colors[0][1]) + light_ray * 0.3
+        base_red = colors[0][0] + depth * (colors[2][0] - colors[0][0]) + light_ray * 0.1
+
+        # Efectos de ondas
+        arr = np.empty((1920, 1080, 3), dtype=np.uint8)
+        arr[..., 0] = np.clip(base_red + wave3, 0, 255)
+        arr[..., 1] = np.clip(base_green + wave1 * 0.5, 0, 255)
+        arr[..., 2] = np.clip(base_blue + wave2 * 0.3, 0, 255)
+
+        return Image.fromarray(arr, 'RGB')
     
     def _create_space_background(self, colors: List[tuple], index: int) -> Image.Image:
         """Crea fondo espacial fotorrealista con nebulosas y estrellas."""
         
-        img = Image.new('RGB', (1080, 1920))
-        import math, random
-        
-        # Base nebulosa cósmica
-        for y in range(1920):
-            for x in range(1080):
-                # Nebulosa con patrones fractales
-                distance = math.sqrt((x - 540)**2 + (y - 960)**2) / 1000
-                noise1 = math.sin(x * 0.005) * math.cos(y * 0.007) * 50
-                noise2 = math.sin(x * 0.003 + y * 0.004) * 30
-                
-                # Colores cósmicos
-                cosmic_intensity = max(0, 100 - distance * 80 + noise1 + noise2)
-                
-                r = max(0, min(255, colors[0][0] + cosmic_intensity * 0.8))
-                g = max(0, min(255, colors[1][1] + cosmic_intensity * 0.6))
-                b = max(0, min(255, colors[2][2] + cosmic_intensity))
-                
-                img.putpixel((x, y), (int(r), int(g), int(b)))
-        
-        # Añadir estrellas realistas
-        random.seed(42 + index)
+        import random
+        rng = random.Random(42 + index)  # RNG local: seguro entre hilos
+
+        x = np.arange(1080, dtype=np.float32)[None, :]
+        y = np.arange(1920, dtype=np.float32)[:, None]
+
+        # Nebulosa con patrones fractales
+        distance = np.sqrt((x - 540) ** 2 + (y - 960) ** 2) / 1000
+        noise1 = np.sin(x * 0.005) * np.cos(y * 0.007) * 50
+        noise2 = np.sin(x * 0.003 + y * 0.004) * 30
+
+        # Colores cósmicos
+        cosmic_intensity = np.maximum(0, 100 - distance * 80 + noise1 + noise2)
+
+        arr = np.empty((1920, 1080, 3), dtype=np.uint8)
+        arr[..., 0] = np.clip(colors[0][0] + cosmic_intensity * 0.8, 0, 255)
+        arr[..., 1] = np.clip(colors[1][1] + cosmic_intensity * 0.6, 0, 255)
+        arr[..., 2] = np.clip(colors[2][2] + cosmic_intensity, 0, 255)
+
+        # Añadir estrellas realistas (halo radial estampado por porción)
         for _ in range(200):
-            star_x = random.randint(0, 1079)
-            star_y = random.randint(0, 1919)
-            brightness = random.randint(150, 255)
-            size = random.choice([1, 1, 1, 2, 2, 3])  # Más estrellas pequeñas
-            
-            # Estrella con halo
-            for dx in range(-size, size + 1):
-                for dy in range(-size, size + 1):
-                    if 0 <= star_x + dx < 1080 and 0 <= star_y + dy < 1920:
-                        distance = math.sqrt(dx**2 + dy**2)
-                        if distance <= size:
-                            star_brightness = int(brightness * (1 - distance / (size + 1)))
-                            current = img.getpixel((star_x + dx, star_y + dy))
-                            new_color = (
-                                min(255, current[0] + star_brightness),
-                                min(255, current[1] + star_brightness),
-                                min(255, current[2] + star_brightness)
-                            )
-                            img.putpixel((star_x + dx, star_y + dy), new_color)
-        
-        return img
+            star_x = rng.randint(0, 1079)
+            star_y = rng.randint(0, 1919)
+            brightness = rng.randint(150, 255)
+            size = rng.choice([1, 1, 1, 2, 2, 3])  # Más estrellas pequeñas
+
+            dy = np.arange(-size, size + 1)[:, None]
+            dx = np.arange(-size, size + 1)[None, :]
+            dist = np.sqrt(dx * dx + dy * dy)
+            halo = np.where(dist <= size,
+                            (brightness * (1 - dist / (size + 1))).astype(np.int16), 0)
+
+            # Recortar el halo a los bordes de la imagen
+            y0, x0 = star_y - size, star_x - size
+            y1, x1 = star_y + size + 1, star_x + size + 1
+            hy0, hx0 = max(0, -y0), max(0, -x0)
+            y0, x0 = max(0, y0), max(0, x0)
+            y1, x1 = min(1920, y1), min(1080, x1)
+
+            region = arr[y0:y1, x0:x1].astype(np.int16)
+            region += halo[hy0:hy0 + (y1 - y0), hx0:hx0 + (x1 - x0), None]
+            arr[y0:y1, x0:x1] = np.clip(region, 0, 255)
+
+        return Image.fromarray(arr, 'RGB')
     
     def _create_tech_background(self, colors: List[tuple], index: int) -> Image.Image:
         """Crea fondo tecnológico con circuitos y patrones digitales."""
         
-        img = Image.new('RGB', (1080, 1920))
-        import math
-        
-        # Patrón de circuito base
-        for y in range(1920):
-            for x in range(1080):
-                # Patrón de rejilla tecnológica
-                grid_x = (x // 40) % 2
-                grid_y = (y // 40) % 2
-                grid_intensity = (grid_x + grid_y) % 2 * 20
-                
-                # Líneas de circuito
-                circuit_line = 0
-                if x % 80 < 3 or y % 120 < 3:
-                    circuit_line = 40
-                
-                # Pulso digital
-                pulse = math.sin(x * 0.02 + y * 0.01) * 15
-                
-                # Color tecnológico
-                base_color = colors[1] if (x + y) % 100 < 50 else colors[0]
-                
-                r = max(0, min(255, base_color[0] + grid_intensity + circuit_line))
-                g = max(0, min(255, base_color[1] + grid_intensity + circuit_line + pulse))
-                b = max(0, min(255, base_color[2] + grid_intensity + circuit_line + pulse * 0.5))
-                
-                img.putpixel((x, y), (int(r), int(g), int(b)))
-        
-        return img
+        xi = np.arange(1080)[None, :]
+        yi = np.arange(1920)[:, None]
+
+        # Patrón de rejilla tecnológica
+        grid_intensity = (((xi // 40) % 2 + (yi // 40) % 2) % 2) * 20
+
+        # Líneas de circuito
+        circuit_line = np.where((xi % 80 < 3) | (yi % 120 < 3), 40, 0)
+
+        # Pulso digital
+        pulse = np.sin(xi * 0.02 + yi * 0.01) * 15
+
+        # Color tecnológico
+        base = np.where(((xi + yi) % 100 < 50)[..., None],
+                        np.array(colors[1]), np.array(colors[0]))
+
+        extra = grid_intensity + circuit_line
+        arr = np.empty((1920, 1080, 3), dtype=np.uint8)
+        arr[..., 0] = np.clip(base[..., 0] + extra, 0, 255)
+        arr[..., 1] = np.clip(base[..., 1] + extra + pulse, 0, 255)
+        arr[..., 2] = np.clip(base[..., 2] + extra + pulse * 0.5, 0, 255)
+
+        return Image.fromarray(arr, 'RGB')
     
     def _create_ancient_background(self, colors: List[tuple], index: int) -> Image.Image:
         """Crea fondo histórico con texturas de piedra y pergamino."""
         
-        img = Image.new('RGB', (1080, 1920))
-        import math
-        
-        # Textura de piedra/pergamino
-        for y in range(1920):
-            for x in range(1080):
-                # Textura rugosa
-                texture1 = math.sin(x * 0.1) * math.cos(y * 0.08) * 20
-                texture2 = math.sin(x * 0.05 + y * 0.07) * 15
-                aged_effect = math.sin(x * 0.03) * math.sin(y * 0.04) * 10
-                
-                # Vetas de edad
-                age_lines = 0
-                if (x + y * 0.5) % 200 < 5:
-                    age_lines = 25
-                
-                # Color envejecido
-                base_color = colors[index % len(colors)]
-                
-                r = max(0, min(255, base_color[0] + texture1 + aged_effect + age_lines))
-                g = max(0, min(255, base_color[1] + texture2 + aged_effect + age_lines))
-                b = max(0, min(255, base_color[2] + texture1 * 0.5 + aged_effect))
-                
-                img.putpixel((x, y), (int(r), int(g), int(b)))
-        
-        return img
+        x = np.arange(1080, dtype=np.float32)[None, :]
+        y = np.arange(1920, dtype=np.float32)[:, None]
+
+        # Textura rugosa
+        texture1 = np.sin(x * 0.1) * np.cos(y * 0.08) * 20
+        texture2 = np.sin(x * 0.05 + y * 0.07) * 15
+        aged_effect = np.sin(x * 0.03) * np.sin(y * 0.04) * 10
+
+        # Vetas de edad
+        age_lines = np.where((x + y * 0.5) % 200 < 5, 25, 0)
+
+        # Color envejecido
+        base_color = colors[index % len(colors)]
+
+        arr = np.empty((1920, 1080, 3), dtype=np.uint8)
+        arr[..., 0] = np.clip(base_color[0] + texture1 + aged_effect + age_lines, 0, 255)
+        arr[..., 1] = np.clip(base_color[1] + texture2 + aged_effect + age_lines, 0, 255)
+        arr[..., 2] = np.clip(base_color[2] + texture1 * 0.5 + aged_effect, 0, 255)
+
+        return Image.fromarray(arr, 'RGB')
     
     def _create_food_background(self, colors: List[tuple], index: int) -> Image.Image:
         """Crea fondo gastronómico con texturas orgánicas."""
         
-        img = Image.new('RGB', (1080, 1920))
-        import math
-        
-        # Textura orgánica/culinaria
-        for y in range(1920):
-            for x in range(1080):
-                # Patrones orgánicos
-                organic1 = math.sin(x * 0.02) * math.cos(y * 0.025) * 30
-                organic2 = math.sin(x * 0.015 + y * 0.02) * 25
-                
-                # Efectos de cocción/caramelización
-                heat_effect = max(0, math.sin(y * 0.01) * 20)
-                
-                # Color gastronómico cálido
-                base_color = colors[(x + y) // 200 % len(colors)]
-                
-                r = max(0, min(255, base_color[0] + organic1 + heat_effect))
-                g = max(0, min(255, base_color[1] + organic2 + heat_effect * 0.7))
-                b = max(0, min(255, base_color[2] + organic1 * 0.3))
-                
-                img.putpixel((x, y), (int(r), int(g), int(b)))
-        
-        return img
+        x = np.arange(1080, dtype=np.float32)[None, :]
+        y = np.arange(1920, dtype=np.float32)[:, None]
+        xi = np.arange(1080)[None, :]
+        yi = np.arange(1920)[:, None]
+
+        # Patrones orgánicos
+        organic1 = np.sin(x * 0.02) * np.cos(y * 0.025) * 30
+        organic2 = np.sin(x * 0.015 + y * 0.02) * 25
+
+        # Efectos de cocción/caramelización
+        heat_effect = np.maximum(0, np.sin(y * 0.01) * 20)
+
+        # Color gastronómico cálido
+        palette = np.array(colors)
+        base = palette[(xi + yi) // 200 % len(colors)]
+
+        arr = np.empty((1920, 1080, 3), dtype=np.uint8)
+        arr[..., 0] = np.clip(base[..., 0] + organic1 + heat_effect, 0, 255)
+        arr[..., 1] = np.clip(base[..., 1] + organic2 + heat_effect * 0.7, 0, 255)
+        arr[..., 2] = np.clip(base[..., 2] + organic1 * 0.3, 0, 255)
+
+        return Image.fromarray(arr, 'RGB')
     
     def _create_sports_background(self, colors: List[tuple], index: int) -> Image.Image:
         """Crea fondo deportivo con energía y movimiento."""
         
-        img = Image.new('RGB', (1080, 1920))
-        import math
-        
-        # Patrones de energía y velocidad
-        for y in range(1920):
-            for x in range(1080):
-                # Líneas de velocidad
-                speed_lines = 0
-                if (x + y * 2) % 60 < 8:
-                    speed_lines = 40
-                
-                # Energía radiante
-                center_distance = math.sqrt((x - 540)**2 + (y - 960)**2)
-                energy = max(0, 100 - center_distance * 0.1) * math.sin(center_distance * 0.01)
-                
-                # Pulso deportivo
-                pulse = math.sin(x * 0.01 + y * 0.008) * 20
-                
-                base_color = colors[index % len(colors)]
-                
-                r = max(0, min(255, base_color[0] + speed_lines + energy * 0.3))
-                g = max(0, min(255, base_color[1] + speed_lines + energy + pulse))
-                b = max(0, min(255, base_color[2] + speed_lines * 0.5 + pulse))
-                
-                img.putpixel((x, y), (int(r), int(g), int(b)))
-        
-        return img
+        x = np.arange(1080, dtype=np.float32)[None, :]
+        y = np.arange(1920, dtype=np.float32)[:, None]
+        xi = np.arange(1080)[None, :]
+        yi = np.arange(1920)[:, None]
+
+        # Líneas de velocidad
+        speed_lines = np.where((xi + yi * 2) % 60 < 8, 40, 0)
+
+        # Energía radiante
+        center_distance = np.sqrt((x - 540) ** 2 + (y - 960) ** 2)
+        energy = np.maximum(0, 100 - center_distance * 0.1) * np.sin(center_distance * 0.01)
+
+        # Pulso deportivo
+        pulse = np.sin(x * 0.01 + y * 0.008) * 20
+
+        base_color = colors[index % len(colors)]
+
+        arr = np.empty((1920, 1080, 3), dtype=np.uint8)
+        arr[..., 0] = np.clip(base_color[0] + speed_lines + energy * 0.3, 0, 255)
+        arr[..., 1] = np.clip(base_color[1] + speed_lines + energy + pulse, 0, 255)
+        arr[..., 2] = np.clip(base_color[2] + speed_lines * 0.5 + pulse, 0, 255)
+
+        return Image.fromarray(arr, 'RGB')
     
     def _create_science_background(self, colors: List[tuple], index: int) -> Image.Image:
         """Crea fondo científico con patrones moleculares."""
         
-        img = Image.new('RGB', (1080, 1920))
-        import math
-        
-        # Estructura molecular/cristalina
-        for y in range(1920):
-            for x in range(1080):
-                # Patrón hexagonal (como moléculas)
-                hex_pattern = (math.sin(x * 0.02) + math.sin(y * 0.02) + 
-                             math.sin((x + y) * 0.015)) * 20
-                
-                # Ondas científicas
-                wave_pattern = math.sin(x * 0.005) * math.cos(y * 0.007) * 25
-                
-                # Enlaces moleculares
-                bonds = 0
-                if (x % 100 < 3 and y % 80 < 3) or (x % 80 < 3 and y % 100 < 3):
-                    bonds = 30
-                
-                base_color = colors[(x // 50 + y // 50) % len(colors)]
-                
-                r = max(0, min(255, base_color[0] + hex_pattern + bonds))
-                g = max(0, min(255, base_color[1] + hex_pattern + wave_pattern + bonds))
-                b = max(0, min(255, base_color[2] + wave_pattern + bonds))
-                
-                img.putpixel((x, y), (int(r), int(g), int(b)))
-        
-        return img
+        x = np.arange(1080, dtype=np.float32)[None, :]
+        y = np.arange(1920, dtype=np.float32)[:, None]
+        xi = np.arange(1080)[None, :]
+        yi = np.arange(1920)[:, None]
+
+        # Patrón hexagonal (como moléculas)
+        hex_pattern = (np.sin(x * 0.02) + np.sin(y * 0.02) +
+                       np.sin((x + y) * 0.015)) * 20
+
+        # Ondas científicas
+        wave_pattern = np.sin(x * 0.005) * np.cos(y * 0.007) * 25
+
+        # Enlaces moleculares
+        bonds = np.where(((xi % 100 < 3) & (yi % 80 < 3)) |
+                         ((xi % 80 < 3) & (yi % 100 < 3)), 30, 0)
+
+        palette = np.array(colors)
+        base = palette[(xi // 50 + yi // 50) % len(colors)]
+
+        arr = np.empty((1920, 1080, 3), dtype=np.uint8)
+        arr[..., 0] = np.clip(base[..., 0] + hex_pattern + bonds, 0, 255)
+        arr[..., 1] = np.clip(base[..., 1] + hex_pattern + wave_pattern + bonds, 0, 255)
+        arr[..., 2] = np.clip(base[..., 2] + wave_pattern + bonds, 0, 255)
+
+        return Image.fromarray(arr, 'RGB')
     
     def _create_generic_realistic_background(self, colors: List[tuple], index: int) -> Image.Image:
         """Crea fondo genérico pero atractivo con patrones abstractos."""
         
-        img = Image.new('RGB', (1080, 1920))
-        import math
-        
-        # Patrón abstracto elegante
-        for y in range(1920):
-            for x in range(1080):
-                # Ondas suaves entrelazadas
-                wave1 = math.sin(x * 0.008) * math.cos(y * 0.01) * 40
-                wave2 = math.sin(x * 0.012 + y * 0.006) * 30
-                
-                # Gradiente diagonal
-                diagonal = (x + y) * 0.05
-                gradient_effect = math.sin(diagonal * 0.01) * 20
-                
-                base_color = colors[((x // 100) + (y // 150)) % len(colors)]
-                
-                r = max(0, min(255, base_color[0] + wave1 + gradient_effect))
-                g = max(0, min(255, base_color[1] + wave2 + gradient_effect))
-                b = max(0, min(255, base_color[2] + wave1 * 0.7 + wave2 * 0.5))
-                
-                img.putpixel((x, y), (int(r), int(g), int(b)))
-        
-        return img
+        x = np.arange(1080, dtype=np.float32)[None, :]
+        y = np.arange(1920, dtype=np.float32)[:, None]
+        xi = np.arange(1080)[None, :]
+        yi = np.arange(1920)[:, None]
+
+        # Ondas suaves entrelazadas
+        wave1 = np.sin(x * 0.008) * np.cos(y * 0.01) * 40
+        wave2 = np.sin(x * 0.012 + y * 0.006) * 30
+
+        # Gradiente diagonal
+        gradient_effect = np.sin((x + y) * 0.05 * 0.01) * 20
+
+        palette = np.array(colors)
+        base = palette[((xi // 100) + (yi // 150)) % len(colors)]
+
+        arr = np.empty((1920, 1080, 3), dtype=np.uint8)
+        arr[..., 0] = np.clip(base[..., 0] + wave1 + gradient_effect, 0, 255)
+        arr[..., 1] = np.clip(base[..., 1] + wave2 + gradient_effect, 0, 255)
+        arr[..., 2] = np.clip(base[..., 2] + wave1 * 0.7 + wave2 * 0.5, 0, 255)
+
+        return Image.fromarray(arr, 'RGB')
     
     def _create_video_structure(self, config: VideoConfig, audio_file: str, images: List[str]) -> Dict:
         """
@@ -1330,12 +1303,8 @@ class VideoCreator:
             # Añadir texto del título
             draw = ImageDraw.Draw(img)
             
-            try:
-                font_large = ImageFont.truetype("arial.ttf", 100)
-                font_small = ImageFont.truetype("arial.ttf", 60)
-            except:
-                font_large = ImageFont.load_default()
-                font_small = ImageFont.load_default()
+            font_large = _get_font(100)
+            font_small = _get_font(60)
             
             # Procesar título para Shorts
             title_parts = title.upper().split()
@@ -1421,13 +1390,17 @@ async def quick_create_short(title: str, script: str, duration: int = 45) -> str
     )
     
     try:
+        # El thumbnail solo depende del título: se despacha a un hilo antes
+        # del render para que PIL trabaje mientras el video se genera
+        thumbnail_future = asyncio.get_running_loop().run_in_executor(
+            None, creator.create_thumbnail, title)
+
         result = await creator.create_video(config)
-        
-        # Crear thumbnail también
-        thumbnail = creator.create_thumbnail(title)
+
+        thumbnail = await thumbnail_future
         if thumbnail:
             logger.info(f"Thumbnail generado: {thumbnail}")
-        
+
         return result
     finally:
         creator.cleanup_temp_files()